@@ -0,0 +1,232 @@
+"""
+Offline benchmarks for the candle pipeline and the full-universe scan.
+
+    python benchmarks/bench_screener.py                     # full grid, compare to baseline
+    python benchmarks/bench_screener.py --quick             # 1 and 220 symbols, 1 and 5 days
+    python benchmarks/bench_screener.py --save-baseline     # store this run as the baseline
+
+Every stage runs on synthetic 5-min bars from ReplayProvider.synthetic_day, so
+no network is touched. For each (stage, symbols, days) the best of --repeat
+wall times is reported with symbols/s and 5-min bars/s, plus the peak traced
+memory of one separate run under tracemalloc. A stage more than --threshold
+slower than the stored baseline is flagged and the exit code is 1. Baselines
+are machine specific: save one on the machine you compare on.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "stock_screener_apk_project"))
+
+import numpy as np
+import pandas as pd
+
+from candle_cache import set_candle_cache
+from data_providers import ReplayProvider, set_data_provider
+from fetch_pipeline import FetchPipeline, set_fetch_pipeline
+from scanner import rank_results, scan_symbols
+from screener_core import (check_first2_against_ma44, get_44ma_on_52candles_from_date, plan_scan_window,
+                           resample_to_10min, split_10min_by_date)
+from signal_engine import evaluate_signals
+from trading_calendar import get_trading_calendar
+
+SCAN_DATE = "2024-05-15"
+SYMBOL_COUNTS = (1, 220, 2000)
+DAY_COUNTS = (1, 5, 20, 60)
+QUICK_SYMBOL_COUNTS = (1, 220)
+QUICK_DAY_COUNTS = (1, 5)
+DISTINCT_SYMBOLS = 20  # generated once and reused, generation is not what we time
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+SIGNALS = ["Confirmed Bullish", "Confirmed Bearish", "Bullish", "Bearish", "No Signal", "Not enough data", "No Data"]
+
+class PanelProvider(ReplayProvider):
+    """Serves pre-generated frames so the scan stage times the pipeline, not the generator."""
+
+    def __init__(self, frames):
+        super().__init__(now=None)
+        self.frames = frames
+
+    def bars(self, symbol, start, end):
+        frame = self.frames.get(symbol)
+        if frame is None:
+            return None
+        frame = frame[(frame.index >= start) & (frame.index < end)]
+        return frame if not frame.empty else None
+
+def make_universe(n_symbols, days):
+    """{symbol: 5-min frame} covering `days` trading sessions up to SCAN_DATE."""
+    generator = ReplayProvider(now=None)
+    scan_date = pd.Timestamp(SCAN_DATE).date()
+    sessions = get_trading_calendar().sessions_before(scan_date, days - 1) + [scan_date]
+    pool = []
+    for i in range(min(n_symbols, DISTINCT_SYMBOLS)):
+        pool.append(pd.concat([generator.synthetic_day(f"BENCH{i}.NS", day) for day in sessions]))
+    return {f"SYM{i}.NS": pool[i % len(pool)] for i in range(n_symbols)}
+
+def prepare(n_symbols, days):
+    frames = make_universe(n_symbols, days)
+    scan_date = pd.Timestamp(SCAN_DATE).date()
+    data_10min = {symbol: resample_to_10min(df) for symbol, df in frames.items()}
+    candles = {symbol: split_10min_by_date(df, scan_date) for symbol, df in data_10min.items()}
+    combined = {symbol: get_44ma_on_52candles_from_date(symbol, SCAN_DATE, data_10min=df)
+                for symbol, df in data_10min.items()}
+    rng = np.random.default_rng(0)
+    results = [(symbol, 1.0, 1.0, 1.0, 1.0, SIGNALS[rng.integers(len(SIGNALS))],
+                "High Volume" if rng.random() < 0.5 else "Low Volume") for symbol in frames]
+    pct_changes = {symbol: float(rng.normal()) for symbol in frames}
+    bars = sum(len(df) for df in frames.values())
+    return {'frames': frames, 'data_10min': data_10min, 'candles': candles, 'combined': combined,
+            'results': results, 'pct_changes': pct_changes, 'bars': bars}
+
+def stage_resample(data):
+    for df in data['frames'].values():
+        resample_to_10min(df)
+
+def stage_ma44(data):
+    for symbol, df in data['data_10min'].items():
+        get_44ma_on_52candles_from_date(symbol, SCAN_DATE, data_10min=df)
+
+def stage_signal(data):
+    for symbol, (_, start_10min) in data['candles'].items():
+        check_first2_against_ma44(start_10min, data['combined'][symbol])
+
+def stage_signal_vectorised(data):
+    evaluate_signals(data['candles'])
+
+def stage_ranking(data):
+    rank_results(data['results'], data['pct_changes'])
+
+def stage_scan(data):
+    set_data_provider(PanelProvider(data['frames']))
+    scan_symbols(list(data['frames']), SCAN_DATE)
+
+STAGES = [
+    ("resample", stage_resample),
+    ("ma44", stage_ma44),
+    ("signal", stage_signal),
+    ("signal_vectorised", stage_signal_vectorised),
+    ("ranking", stage_ranking),
+    ("scan", stage_scan),
+]
+
+def measure(func, data, repeat):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        best = min(_timed(func, data) for _ in range(repeat))
+        tracemalloc.start()
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+def _timed(func, data):
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+def run(symbol_counts, day_counts, stages, repeat):
+    # The scan stage runs without the on-disk cache and with an unthrottled pipeline
+    set_candle_cache(None)
+    set_fetch_pipeline(FetchPipeline(rate_per_sec=1e9, burst=1e9))
+    start, end = (pd.Timestamp(day).date() for day in plan_scan_window(SCAN_DATE))
+    scan_sessions = len(get_trading_calendar().trading_days(start, end))
+    # The scan plans its own window, so it runs once per universe size on enough history to fill it
+    scan_days = min([days for days in day_counts if days >= scan_sessions], default=None)
+    results = []
+    for n_symbols in symbol_counts:
+        for days in day_counts:
+            data = prepare(n_symbols, days)
+            for name, func in stages:
+                if name == "scan" and days != scan_days:
+                    continue
+                seconds, peak = measure(func, data, repeat)
+                results.append({
+                    'stage': name, 'symbols': n_symbols, 'days': days, 'seconds': seconds,
+                    'symbols_per_sec': n_symbols / seconds if seconds else float('inf'),
+                    'bars_per_sec': data['bars'] / seconds if seconds else float('inf'),
+                    'peak_mb': peak / 2 ** 20,
+                })
+                print(_format(results[-1]), flush=True)
+    return results
+
+def _key(result):
+    return f"{result['stage']}/{result['symbols']}/{result['days']}"
+
+def _format(result, note=""):
+    return (f"{result['stage']:<18} {result['symbols']:>6} sym {result['days']:>3} d "
+            f"{result['seconds'] * 1000:>10.1f} ms {result['symbols_per_sec']:>12.0f} sym/s "
+            f"{result['bars_per_sec']:>12.0f} bars/s {result['peak_mb']:>8.1f} MB {note}").rstrip()
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print("\nAgainst baseline:")
+    for result in results:
+        previous = baseline.get(_key(result))
+        if previous is None:
+            print(_format(result, "(new)"))
+            continue
+        change = result['seconds'] / previous['seconds'] - 1 if previous['seconds'] else 0.0
+        note = f"{change:+.0%}"
+        if change > threshold:
+            note += " REGRESSION"
+            regressions.append(result)
+        print(_format(result, note))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small grid for a fast check")
+    parser.add_argument("--symbols", help="comma-separated symbol counts, e.g. 1,220,2000")
+    parser.add_argument("--days", help="comma-separated history lengths in days, e.g. 1,5,20,60")
+    parser.add_argument("--stages", help="comma-separated subset of: " + ", ".join(name for name, _ in STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="flag stages slower than baseline by more than this fraction")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", help="write this run's results as JSON")
+    args = parser.parse_args(argv)
+
+    symbol_counts = QUICK_SYMBOL_COUNTS if args.quick else SYMBOL_COUNTS
+    day_counts = QUICK_DAY_COUNTS if args.quick else DAY_COUNTS
+    if args.symbols:
+        symbol_counts = [int(n) for n in args.symbols.split(",")]
+    if args.days:
+        day_counts = [int(n) for n in args.days.split(",")]
+    stages = STAGES
+    if args.stages:
+        wanted = args.stages.split(",")
+        stages = [(name, func) for name, func in STAGES if name in wanted]
+
+    results = run(symbol_counts, day_counts, stages, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({_key(result): result for result in results})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to store one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ title = Stock Screener
 package.name = stockscreener
 package.domain = org.example
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas
+source.include_exts = py,png,jpg,kv,atlas,txt
 version = 1.0
 requirements = python3,kivy,yfinance,pandas
 orientation = portrait
@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from trading_calendar import IST, get_trading_calendar, now_ist
+
+CLOSE_GRACE = timedelta(minutes=5)  # the last bars can still change this long after the close
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "candle_cache.sqlite3")
+MAX_AGE_DAYS = 60
+MAX_ROWS = 2_000_000
+EVICT_EVERY_STORES = 50
+SQLITE_TIMEOUT_SEC = 30
+EVICT_BATCH_SESSIONS = 100
+
+OHLCV_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+def session_is_complete(day, now=None):
+    """
+    A trading day is final once it is in the past, or CLOSE_GRACE after
+    today's close so a fetch made right at the close does not freeze a
+    session whose last bars have not landed yet.
+    """
+    now = now or now_ist()
+    today = now.date()
+    if day < today:
+        return True
+    if day > today:
+        return False
+    _, close = get_trading_calendar().session_bounds(day)
+    return now >= close + CLOSE_GRACE
+
+class CandleCache:
+    """
+    On-disk store of normalised 5-min candles keyed by symbol and trading day.
+
+    The sessions table records which (symbol, day) pairs have been fetched and
+    whether that day is final, so completed days (including holidays with no
+    bars) are served from disk and only the open session is ever re-fetched.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_days=MAX_AGE_DAYS, max_rows=MAX_ROWS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._stores = 0
+        # Backtest worker processes share the file, so wait out each other's write locks
+        self._conn = sqlite3.connect(path, timeout=SQLITE_TIMEOUT_SEC, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS candles ("
+                "symbol TEXT NOT NULL, day TEXT NOT NULL, ts INTEGER NOT NULL, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL, "
+                "PRIMARY KEY (symbol, ts))")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "symbol TEXT NOT NULL, day TEXT NOT NULL, complete INTEGER NOT NULL, "
+                "fetched_at REAL NOT NULL, PRIMARY KEY (symbol, day))")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS candles_symbol_day ON candles (symbol, day)")
+        self.evict()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def complete_days(self, symbol, start_day, end_day):
+        """Returns the set of days in [start_day, end_day) already stored as final."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day FROM sessions WHERE symbol = ? AND day >= ? AND day < ? AND complete = 1",
+                (symbol, start_day.isoformat(), end_day.isoformat())).fetchall()
+        return {datetime.strptime(day, "%Y-%m-%d").date() for (day,) in rows}
+
+    def last_timestamp(self, symbol, day):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(ts) FROM candles WHERE symbol = ? AND day = ?",
+                (symbol, day.isoformat())).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return pd.Timestamp(row[0], unit='s', tz='UTC').tz_convert(IST)
+
+    def load(self, symbol, start_day, end_day):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, open, high, low, close, volume FROM candles "
+                "WHERE symbol = ? AND day >= ? AND day < ? ORDER BY ts",
+                (symbol, start_day.isoformat(), end_day.isoformat())).fetchall()
+        if not rows:
+            return None
+        frame = pd.DataFrame(rows, columns=['ts'] + OHLCV_COLS)
+        index = pd.to_datetime(frame.pop('ts'), unit='s', utc=True).dt.tz_convert(IST)
+        frame.index = pd.DatetimeIndex(index, name='Datetime')
+        return frame
+
+    def store(self, symbol, frame, fetched_days, now=None):
+        """
+        Upserts the bars in frame (an IST-indexed OHLCV frame, may be None) and
+        marks fetched_days as covered. Re-stored bars replace older copies, so
+        the still-forming last bar of a live session is kept up to date.
+        """
+        now = now or now_ist()
+        rows = []
+        if frame is not None and not frame.empty:
+            index = frame.index.tz_convert('UTC')
+            ts = (index - _EPOCH) // pd.Timedelta(seconds=1)
+            days = frame.index.strftime("%Y-%m-%d")
+            values = frame[OHLCV_COLS].to_numpy(dtype=float)
+            rows = [(symbol, day, int(t), *map(float, v)) for day, t, v in zip(days, ts, values)]
+        sessions = [(symbol, day.isoformat(), int(session_is_complete(day, now)), time.time())
+                    for day in fetched_days]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)", sessions)
+            self._stores += 1
+            evict_now = self._stores % EVICT_EVERY_STORES == 0
+        if evict_now:
+            self.evict()
+
+    def evict(self):
+        """
+        Drops sessions not fetched within max_age_days, then the least recently
+        fetched sessions until the store is under max_rows bars.
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM candles WHERE (symbol, day) IN "
+                "(SELECT symbol, day FROM sessions WHERE fetched_at < ?)", (cutoff,))
+            self._conn.execute("DELETE FROM sessions WHERE fetched_at < ?", (cutoff,))
+            total = self._conn.execute("SELECT COUNT(*) FROM candles").fetchone()[0]
+            while total > self.max_rows:
+                oldest = self._conn.execute(
+                    "SELECT symbol, day FROM sessions ORDER BY fetched_at LIMIT ?", (EVICT_BATCH_SESSIONS,)).fetchall()
+                if not oldest:
+                    break
+                self._conn.executemany("DELETE FROM candles WHERE symbol = ? AND day = ?", oldest)
+                self._conn.executemany("DELETE FROM sessions WHERE symbol = ? AND day = ?", oldest)
+                total = self._conn.execute("SELECT COUNT(*) FROM candles").fetchone()[0]
+
+_cache = None
+_cache_enabled = True
+_cache_lock = threading.Lock()
+
+def get_candle_cache():
+    """Returns the shared cache, opening it on first use; None when disabled."""
+    global _cache
+    with _cache_lock:
+        if not _cache_enabled:
+            return None
+        if _cache is None:
+            _cache = CandleCache()
+        return _cache
+
+def set_candle_cache(cache):
+    """Replaces the shared cache. Pass None to disable caching entirely."""
+    global _cache, _cache_enabled
+    with _cache_lock:
+        _cache = cache
+        _cache_enabled = cache is not None
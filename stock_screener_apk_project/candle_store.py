@@ -0,0 +1,109 @@
+import numpy as np
+
+from screener_core import CANDLES_BEFORE, CANDLES_START, MA_WINDOW
+
+OPEN, HIGH, LOW, CLOSE = range(4)
+OHLC_COLS = ['Open', 'High', 'Low', 'Close']
+
+class SymbolCandles:
+    """
+    The 10-min bars one symbol's signal needs, in preallocated arrays: the
+    last CANDLES_BEFORE bars before the session followed by the session's
+    first CANDLES_START bars, as float64 OHLC, int64 volume and int64 bar
+    start (ns since the epoch), plus the sum and count behind the prior-session
+    volume average. A running sum over the last ma_window closes gives each
+    bar's MA in O(1) as it is appended or replaced. Bars are kept oldest first in one contiguous block, so
+    every accessor returns a view rather than a copy. The window rolls: once
+    the arrays are full, append() drops the oldest bar.
+    """
+
+    __slots__ = ('ohlc', 'volume', 'timestamps', 'ma', 'size', 'session_bars', 'volume_sum', 'volume_count',
+                 'ma_window', 'ma_sum')
+
+    def __init__(self, capacity=CANDLES_BEFORE + CANDLES_START, ma_window=MA_WINDOW):
+        self.ohlc = np.empty((capacity, 4))
+        self.volume = np.empty(capacity, dtype=np.int64)
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.ma = np.full(capacity, np.nan)  # MA ending at each bar; only session bars are filled in
+        self.size = 0
+        self.session_bars = 0
+        self.volume_sum = 0.0
+        self.volume_count = 0
+        self.ma_window = ma_window
+        self.ma_sum = 0.0  # sum of the last ma_window closes
+
+    @classmethod
+    def from_before(cls, before_10min, capacity=CANDLES_BEFORE + CANDLES_START, ma_window=MA_WINDOW):
+        """Store seeded with the prior-session 10-min bars of a scan window (None for none)."""
+        store = cls(capacity, ma_window)
+        if before_10min is None or before_10min.empty:
+            return store
+        tail = before_10min.tail(min(CANDLES_BEFORE, capacity))
+        n = len(tail)
+        store.ohlc[:n] = tail[OHLC_COLS].to_numpy(dtype=float)
+        store.volume[:n] = tail['Volume'].to_numpy(dtype=float).astype(np.int64)
+        store.timestamps[:n] = tail.index.as_unit('ns').asi8
+        store.size = n
+        store.ma_sum = float(store.ohlc[max(0, n - ma_window):n, CLOSE].sum())
+        # The volume average spans every prior bar in the window, not just the stored tail
+        store.volume_sum = float(before_10min['Volume'].sum())
+        store.volume_count = int(before_10min['Volume'].count())
+        return store
+
+    @property
+    def capacity(self):
+        return len(self.volume)
+
+    def append(self, ts, o, h, l, c, v, session=True):
+        if self.size == self.capacity:
+            # Slide the window left by one bar so views stay contiguous
+            self.ohlc[:-1] = self.ohlc[1:]
+            self.volume[:-1] = self.volume[1:]
+            self.timestamps[:-1] = self.timestamps[1:]
+            self.ma[:-1] = self.ma[1:]
+            self.size -= 1
+            self.session_bars = min(self.session_bars, self.size)
+        self.ma_sum += c
+        if self.size >= self.ma_window:
+            self.ma_sum -= self.ohlc[self.size - self.ma_window, CLOSE]
+        self._write(self.size, ts, o, h, l, c, v)
+        self.size += 1
+        if session:
+            self.session_bars += 1
+
+    def replace_last(self, ts, o, h, l, c, v):
+        self.ma_sum += c - self.ohlc[self.size - 1, CLOSE]
+        self._write(self.size - 1, ts, o, h, l, c, v)
+
+    def _write(self, i, ts, o, h, l, c, v):
+        self.ohlc[i] = (o, h, l, c)
+        self.volume[i] = v
+        self.timestamps[i] = ts
+        self.ma[i] = self.ma_sum / self.ma_window if i + 1 >= self.ma_window else np.nan
+
+    def last_timestamp(self):
+        return int(self.timestamps[self.size - 1]) if self.size else None
+
+    def last_bar(self):
+        """(open, high, low, close, volume) of the newest bar."""
+        o, h, l, c = self.ohlc[self.size - 1].tolist()
+        return o, h, l, c, int(self.volume[self.size - 1])
+
+    def bars(self):
+        return self.ohlc[:self.size]
+
+    def closes(self):
+        return self.ohlc[:self.size, CLOSE]
+
+    def session(self):
+        return self.ohlc[self.size - self.session_bars:self.size]
+
+    def session_volume(self):
+        return self.volume[self.size - self.session_bars:self.size]
+
+    def avg_volume(self):
+        return self.volume_sum / self.volume_count if self.volume_count else None
+
+    def session_ma(self):
+        """Trailing mean of ma_window closes at each session bar; NaN while the history is shorter."""
+        return self.ma[self.size - self.session_bars:self.size]
@@ -0,0 +1,194 @@
+import math
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from trading_calendar import IST, SESSION_OPEN, bars_per_session, get_trading_calendar, now_ist
+
+OHLCV_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+SESSION_BARS = bars_per_session(5)  # 09:15 to 15:30 in 5-min bars
+RECENT_SESSIONS = 5  # served when a download names no range
+YAHOO_5M_MAX_DAYS = 60  # Yahoo's limit on the span of one 5-min request
+# yf.download's own thread pool; up to MAX_WORKERS x DOWNLOAD_THREADS requests are in flight
+DOWNLOAD_THREADS = 2
+
+def recent_window():
+    """(start, end) date strings for the last RECENT_SESSIONS trading sessions up to today."""
+    start, end = get_trading_calendar().recent_window(now_ist().date(), RECENT_SESSIONS)
+    return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+class YahooProvider:
+    """The live data source: yf.download with 5-min bars."""
+
+    name = "yahoo"
+    max_days = YAHOO_5M_MAX_DAYS
+
+    def __init__(self, threads=DOWNLOAD_THREADS):
+        self.threads = threads
+
+    def download(self, tickers, start_date=None, end_date=None, timeout=None, group_by=None):
+        import yfinance as yf
+        kwargs = {'progress': False, 'threads': self.threads}
+        if timeout:
+            kwargs['timeout'] = timeout
+        if group_by:
+            kwargs['group_by'] = group_by
+        if not (start_date and end_date):
+            start_date, end_date = recent_window()
+        return yf.download(tickers, interval="5m", start=start_date, end=end_date, auto_adjust=False, **kwargs)
+
+class ReplayProvider:
+    """
+    Offline stand-in for YahooProvider. Serves 5-min OHLCV for each symbol from
+    <data_dir>/<SYMBOL>.csv or .parquet (a Datetime index column plus OHLCV),
+    or, without a data_dir, from a seeded generator that is deterministic per
+    (symbol, day) so any window of the same day returns the same bars.
+
+    latency/jitter (seconds) delay every request, failure_rate fails whole
+    requests and ticker_failure_rate drops single tickers from a response, the
+    way Yahoo does under rate limiting. Each request draws these from its own
+    generator seeded by (seed, tickers, window, attempt), so the same requests
+    fail however the worker threads or processes are scheduled. Bars later than now() are never served,
+    so a live session replays the day as it unfolds; pass now=None to serve
+    everything.
+    """
+
+    name = "replay"
+    max_days = None
+
+    def __init__(self, data_dir=None, seed=0, latency=0.0, jitter=0.0, failure_rate=0.0,
+                 ticker_failure_rate=0.0, now=now_ist):
+        self.data_dir = data_dir
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.ticker_failure_rate = ticker_failure_rate
+        self.now = now
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._files = {}
+
+    def __getstate__(self):
+        # Process-pool workers get a copy without the loaded files or the lock
+        state = dict(self.__dict__)
+        state['_files'] = {}
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _request_rng(self, symbols, start, end):
+        key = f"{self.seed}:{','.join(symbols)}:{start.isoformat()}:{end.isoformat()}"
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        return random.Random(zlib.crc32(f"{key}:{attempt}".encode()))
+
+    def _file_frame(self, symbol):
+        if symbol not in self._files:
+            frame = None
+            for ext, reader in ((".parquet", pd.read_parquet), (".csv", pd.read_csv)):
+                path = os.path.join(self.data_dir, symbol + ext)
+                if os.path.exists(path):
+                    frame = reader(path)
+                    break
+            if frame is not None:
+                if 'Datetime' in frame.columns:
+                    frame = frame.set_index('Datetime')
+                frame.index = pd.to_datetime(frame.index)
+                if frame.index.tz is None:
+                    frame.index = frame.index.tz_localize(IST)
+                frame = frame.tz_convert(IST).sort_index()
+            self._files[symbol] = frame
+        return self._files[symbol]
+
+    def synthetic_day(self, symbol, day):
+        """Generated 5-min bars for one trading day, seeded by (seed, symbol, day)."""
+        key = f"{self.seed}:{symbol}:{day.isoformat()}".encode()
+        rng = np.random.default_rng(zlib.crc32(key))
+        phase = zlib.crc32(symbol.encode()) % 360
+        base = 100.0 * (1.5 + math.sin(math.radians(phase + day.toordinal() * 3)))
+        closes = base * np.exp(np.cumsum(rng.normal(0, 0.002, SESSION_BARS)))
+        opens = np.concatenate(([base], closes[:-1])) * (1 + rng.normal(0, 0.0005, SESSION_BARS))
+        highs = np.maximum(opens, closes) * (1 + rng.random(SESSION_BARS) * 0.001)
+        lows = np.minimum(opens, closes) * (1 - rng.random(SESSION_BARS) * 0.001)
+        volumes = rng.integers(1_000, 50_000, SESSION_BARS).astype(float)
+        session_open = pd.Timestamp(day).tz_localize(IST) + timedelta(hours=SESSION_OPEN[0], minutes=SESSION_OPEN[1])
+        index = pd.date_range(session_open, periods=SESSION_BARS, freq="5min", name="Datetime")
+        return pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes, 'Volume': volumes}, index=index)
+
+    def bars(self, symbol, start, end):
+        if self.data_dir:
+            frame = self._file_frame(symbol)
+            if frame is None:
+                return None
+            frame = frame[(frame.index >= start) & (frame.index < end)]
+        else:
+            days = get_trading_calendar().trading_days(start.date(), end.date())
+            parts = [self.synthetic_day(symbol, day) for day in days]
+            if not parts:
+                return None
+            frame = pd.concat(parts)
+            frame = frame[(frame.index >= start) & (frame.index < end)]
+        if self.now is not None:
+            now = pd.Timestamp(self.now())
+            frame = frame[frame.index <= (now.tz_localize(IST) if now.tzinfo is None else now)]
+        return frame[OHLCV_COLS] if not frame.empty else None
+
+    def _window(self, start_date, end_date):
+        if not (start_date and end_date):
+            start_date, end_date = recent_window()
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        start = start.tz_localize(IST) if start.tzinfo is None else start.tz_convert(IST)
+        end = end.tz_localize(IST) if end.tzinfo is None else end.tz_convert(IST)
+        return start, end
+
+    def download(self, tickers, start_date=None, end_date=None, timeout=None, group_by=None):
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        start, end = self._window(start_date, end_date)
+        rng = self._request_rng(symbols, start, end)
+        delay = self.latency + rng.random() * self.jitter
+        if timeout and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"replay request timed out after {timeout}s")
+        time.sleep(delay)
+        if rng.random() < self.failure_rate:
+            raise ConnectionError("replay: injected request failure")
+        frames = {}
+        for symbol in symbols:
+            if rng.random() < self.ticker_failure_rate:
+                continue
+            frame = self.bars(symbol, start, end)
+            if frame is not None:
+                frames[symbol] = frame
+        if not frames:
+            return pd.DataFrame()
+        # Same layout yf.download produces: (ticker, field) with group_by="ticker", else (field, ticker)
+        data = pd.concat(frames, axis=1)
+        if group_by != "ticker":
+            data = data.swaplevel(0, 1, axis=1)
+        return data
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def get_data_provider():
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = YahooProvider()
+        return _provider
+
+def set_data_provider(provider):
+    global _provider
+    with _provider_lock:
+        _provider = provider
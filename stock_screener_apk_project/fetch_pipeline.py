@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from metrics import get_metrics
+
+MAX_WORKERS = 4
+RATE_PER_SEC = 8.0  # Yahoo requests started per second; yf.download sends one per ticker
+BURST = 50  # one full chunk may start at once
+RETRIES = 3
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_MAX_SEC = 30.0
+REQUEST_TIMEOUT_SEC = 20
+
+class FetchError(Exception):
+    pass
+
+class TokenBucket:
+    """Blocking token bucket: acquire(n) waits until n requests may start."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        # More tokens than the bucket holds wait for a full bucket and leave it
+        # in debt, so later callers wait and the average rate still holds
+        needed = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+class FetchPipeline:
+    """
+    Runs download units (lists of symbols) on a bounded worker pool. Every
+    download takes one token per ticker from a shared bucket (yf.download
+    sends a request per ticker), gets a per-request timeout and
+    is retried with exponential backoff and jitter; symbols a unit reports as
+    failed are retried on their own. Results are handed to on_result in the
+    calling thread as each unit completes, so callers can stream them.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, rate_per_sec=RATE_PER_SEC, burst=BURST, retries=RETRIES,
+                 backoff_base=BACKOFF_BASE_SEC, backoff_max=BACKOFF_MAX_SEC, timeout=REQUEST_TIMEOUT_SEC):
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        time.sleep(delay * (0.5 + random.random() / 2))
+
+    def _run_unit(self, unit, fetch_unit, on_give_up):
+        """
+        fetch_unit(symbols, timeout) returns ({symbol: frame}, failed_symbols)
+        or raises to have the whole unit retried.
+        """
+        metrics = get_metrics()
+        frames = {}
+        pending = list(unit)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                metrics.incr("retries")
+                with metrics.timer("backoff"):
+                    self._backoff(attempt)
+            with metrics.timer("rate_wait"):
+                self.bucket.acquire(len(pending))
+            metrics.incr("requests")
+            try:
+                with metrics.timer("fetch", pending):
+                    got, failed = fetch_unit(pending, self.timeout)
+            except Exception as e:
+                metrics.error("request_failures", f"{', '.join(pending)} (attempt {attempt + 1}): {e}")
+                continue
+            metrics.incr("ticker_failures", len(failed))
+            failed = set(failed)
+            frames.update({symbol: frame for symbol, frame in got.items() if symbol not in failed})
+            pending = [symbol for symbol in pending if symbol in failed]
+            if not pending:
+                break
+        if pending:
+            metrics.incr("gave_up", len(pending))
+            fallback = on_give_up(pending) if on_give_up else {}
+            for symbol in pending:
+                frames[symbol] = fallback.get(symbol)
+        return frames
+
+    def run(self, units, fetch_unit, on_result=None, on_give_up=None):
+        """
+        Fetches every unit and returns the merged {symbol: frame}. on_give_up
+        (symbols) may return stale frames for symbols that exhausted their retries.
+        """
+        results = {}
+        if not units:
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(units))) as pool:
+            futures = [pool.submit(self._run_unit, unit, fetch_unit, on_give_up) for unit in units]
+            for future in as_completed(futures):
+                frames = future.result()
+                results.update(frames)
+                if on_result:
+                    on_result(frames)
+        return results
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_fetch_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = FetchPipeline()
+        return _pipeline
+
+def set_fetch_pipeline(pipeline):
+    global _pipeline
+    with _pipeline_lock:
+        _pipeline = pipeline
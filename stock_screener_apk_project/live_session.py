@@ -0,0 +1,276 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from candle_store import CLOSE, OPEN, SymbolCandles
+from metrics import get_metrics
+from screener_core import (CANDLES_START, MA_WINDOW, fetch_5min_data_bulk,
+                           load_scan_data_bulk, split_10min_by_date, volume_status_from)
+from signal_engine import classify, first2_features
+from trading_calendar import IST, SESSION_OPEN
+
+BAR_MINUTES = 10
+SESSION_OFFSET_MINUTES = (SESSION_OPEN[0] * 60 + SESSION_OPEN[1]) % BAR_MINUTES  # same bins as resample_bars
+PARTS_PER_BAR = BAR_MINUTES // 5  # 5-min parts of one forming 10-min bar
+
+def bar_label(ts):
+    """Start of the 10-min bar a 5-min timestamp falls into, as resample_bars bins it."""
+    minutes = ts.hour * 60 + ts.minute
+    return ts.floor('min') - timedelta(minutes=(minutes - SESSION_OFFSET_MINUTES) % BAR_MINUTES)
+
+def _timestamp(ns):
+    """Inverse of Timestamp.value for the IST bar times a snapshot stores; -1 stands for None."""
+    return None if ns < 0 else pd.Timestamp(ns, tz='UTC').tz_convert(IST)
+
+def _or_nan(value):
+    return np.nan if value is None else value
+
+class LiveSymbol:
+    """
+    Per-symbol live state: a SymbolCandles holding the prior-session bars and
+    the session's first CANDLES_START 10-min bars (the last one possibly still
+    forming), the 5-min parts of that forming bar, and what the ranking needs
+    from the rest of the session (its open and latest close).
+    """
+
+    __slots__ = ('symbol', 'ma_window', 'candles', 'parts', 'last_ts', 'day_open', 'last_close', 'frozen', 'signal')
+
+    def __init__(self, symbol, before_10min, ma_window=MA_WINDOW):
+        self.symbol = symbol
+        self.ma_window = ma_window
+        self.candles = SymbolCandles.from_before(before_10min, ma_window=ma_window)
+        self.parts = {}  # 5-min bars of the still-forming first2 candle
+        self.last_ts = None
+        self.day_open = None
+        self.last_close = None
+        self.frozen = False
+        self.signal = None
+
+    def session_ma(self):
+        return self.candles.session_ma()
+
+    def ingest(self, ts, o, h, l, c, v):
+        """
+        Folds one 5-min bar into the state in O(1). A bar at the last seen
+        timestamp replaces the earlier copy, since the newest 5-min bar keeps
+        changing until it closes. Returns True when the first two candles or
+        their MA values changed, i.e. when the signal must be re-evaluated.
+        """
+        if self.last_ts is not None and ts < self.last_ts:
+            return False
+        self.last_ts = ts
+        if self.day_open is None:
+            self.day_open = o
+        self.last_close = c
+        if self.frozen:
+            return False
+        candles = self.candles
+        label = bar_label(ts).value
+        if candles.session_bars and label == candles.last_timestamp():
+            self.parts[ts] = (o, h, l, c, v)
+        elif candles.session_bars < CANDLES_START:
+            self.parts = {ts: (o, h, l, c, v)}
+            candles.append(label, o, h, l, c, v)
+            return True
+        else:
+            self.frozen = True
+            self.parts = {}
+            return False
+        parts = [self.parts[key] for key in sorted(self.parts)]
+        bar = (parts[0][0], max(p[1] for p in parts), min(p[2] for p in parts),
+               parts[-1][3], int(sum(p[4] for p in parts)))
+        if bar == candles.last_bar():
+            return False
+        candles.replace_last(label, *bar)
+        return True
+
+    def row(self):
+        first_open = first_close = second_open = second_close = ""
+        session = self.candles.session()
+        if len(session) >= 1:
+            first_open, first_close = session[0, OPEN], session[0, CLOSE]
+        if len(session) >= 2:
+            second_open, second_close = session[1, OPEN], session[1, CLOSE]
+        volume_status = volume_status_from(self.candles.avg_volume(), self.candles.session_volume().tolist())
+        return (self.symbol, first_open, first_close, second_open, second_close, self.signal, volume_status)
+
+    def pct_change(self):
+        if self.day_open is None or self.last_close is None:
+            return None
+        return ((self.last_close - self.day_open) / self.day_open) * 100
+
+class LiveSession:
+    """
+    Stateful live screener for one trading day. start() loads the full scan
+    window once; every later refresh() fetches only the session's new bars
+    (the candle cache turns this into a tail download), folds them into each
+    LiveSymbol and re-evaluates only the symbols whose first two candles or
+    MA changed.
+    """
+
+    def __init__(self, symbols, scan_date, chunk_size=None):
+        self.symbols = list(symbols)
+        self.scan_date = scan_date
+        self.chunk_size = chunk_size
+        self.states = {}
+        self.missing = set()
+
+    def _bulk_kwargs(self):
+        return {'chunk_size': self.chunk_size} if self.chunk_size else {}
+
+    def start(self, on_rows=None):
+        """
+        Loads the scan window. Like scan_symbols, on_rows(part_rows, done) is
+        called with each download part's result rows as soon as it is screened.
+        """
+        start_date = self.scan_date.strftime("%Y-%m-%d")
+        reported = set()
+
+        def on_part(part):
+            dirty = set()
+            for symbol, (df_5min, data_10min) in part.items():
+                before_10min = split_10min_by_date(data_10min, self.scan_date)[0] if data_10min is not None else None
+                state = LiveSymbol(symbol, before_10min)
+                self.states[symbol] = state
+                if df_5min is not None:
+                    dirty |= self._ingest(state, df_5min)
+            self._evaluate(dirty)
+            self._report(part, reported, on_rows)
+
+        load_scan_data_bulk(self.symbols, start_date, on_result=on_part, **self._bulk_kwargs())
+        for symbol in self.symbols:
+            if symbol not in self.states:
+                self.states[symbol] = LiveSymbol(symbol, None)
+
+    def _report(self, symbols, reported, on_rows):
+        if on_rows:
+            reported.update(symbols)
+            on_rows([self._result(symbol)[0] for symbol in symbols], len(reported))
+
+    def _ingest(self, state, df_5min):
+        day = df_5min[df_5min.index.date == self.scan_date]
+        if state.last_ts is not None:
+            day = day[day.index >= state.last_ts]
+        changed = False
+        for ts, o, h, l, c, v in zip(day.index, day['Open'], day['High'], day['Low'], day['Close'], day['Volume']):
+            changed = state.ingest(ts, o, h, l, c, v) or changed
+        return {state.symbol} if changed else set()
+
+    def refresh(self, on_rows=None):
+        """
+        Pulls the new bars for every symbol and returns the set of re-evaluated
+        symbols; on_rows works as in start().
+        """
+        start_date = self.scan_date.strftime("%Y-%m-%d")
+        end_date = (self.scan_date + timedelta(days=1)).strftime("%Y-%m-%d")
+        reevaluated = set()
+        reported = set()
+
+        def on_part(frames):
+            dirty = set()
+            for symbol, df_5min in frames.items():
+                if df_5min is not None:
+                    dirty |= self._ingest(self.states[symbol], df_5min)
+            self._evaluate(dirty)
+            reevaluated.update(dirty)
+            self._report(frames, reported, on_rows)
+
+        fetch_5min_data_bulk(self.symbols, start_date, end_date, on_result=on_part, **self._bulk_kwargs())
+        return reevaluated
+
+    def _evaluate(self, symbols):
+        symbols = [symbol for symbol in symbols if self.states[symbol].candles.session_bars]
+        if not symbols:
+            return
+        first2 = np.full((len(symbols), CANDLES_START, 5), np.nan)
+        last2_ma = np.full((len(symbols), 2), np.nan)
+        start_counts = np.zeros(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            state = self.states[symbol]
+            n = state.candles.session_bars
+            first2[i, :n, :4] = state.candles.session()
+            first2[i, :n, 4] = state.candles.session_volume()
+            ma = state.session_ma()[-2:]
+            last2_ma[i, 2 - len(ma):] = ma
+            start_counts[i] = n
+        with get_metrics().timer("signal"):
+            labels = classify(first2_features(first2, last2_ma, start_counts))
+        for symbol, label in zip(symbols, labels.tolist()):
+            self.states[symbol].signal = label
+
+    def results(self):
+        """Returns (results, pct_changes) in the same shape as a full scan."""
+        results = []
+        pct_changes = {}
+        for symbol in self.symbols:
+            row, pct_changes[symbol] = self._result(symbol)
+            results.append(row)
+        return results, pct_changes
+
+    def _result(self, symbol):
+        state = self.states[symbol]
+        if state.day_open is None:
+            return (symbol, "", "", "", "", "No Data", ""), None
+        return state.row(), state.pct_change()
+
+    def snapshot(self):
+        """
+        The session as flat arrays, one row per symbol, that restore() turns
+        back into the same session; this is what the warm-start file holds.
+        """
+        states = [self.states[symbol] for symbol in self.symbols]
+        parts_ts = np.full((len(states), PARTS_PER_BAR), -1, dtype=np.int64)
+        parts = np.zeros((len(states), PARTS_PER_BAR, 5))
+        for i, state in enumerate(states):
+            for j, ts in enumerate(sorted(state.parts)):
+                parts_ts[i, j] = ts.value
+                parts[i, j] = state.parts[ts]
+        return {
+            'symbols': np.array(self.symbols),
+            'scan_date': np.array(self.scan_date.isoformat()),
+            'ohlc': np.stack([state.candles.ohlc for state in states]),
+            'volume': np.stack([state.candles.volume for state in states]),
+            'timestamps': np.stack([state.candles.timestamps for state in states]),
+            'ma': np.stack([state.candles.ma for state in states]),
+            'size': np.array([state.candles.size for state in states], dtype=np.int64),
+            'session_bars': np.array([state.candles.session_bars for state in states], dtype=np.int64),
+            'volume_sum': np.array([state.candles.volume_sum for state in states], dtype=float),
+            'volume_count': np.array([state.candles.volume_count for state in states], dtype=np.int64),
+            'ma_sum': np.array([state.candles.ma_sum for state in states], dtype=float),
+            'parts_ts': parts_ts,
+            'parts': parts,
+            'last_ts': np.array([-1 if state.last_ts is None else state.last_ts.value for state in states],
+                                dtype=np.int64),
+            'day_open': np.array([_or_nan(state.day_open) for state in states], dtype=float),
+            'last_close': np.array([_or_nan(state.last_close) for state in states], dtype=float),
+            'frozen': np.array([state.frozen for state in states], dtype=bool),
+            'signal': np.array([state.signal or "" for state in states]),
+        }
+
+    @classmethod
+    def restore(cls, arrays, chunk_size=None):
+        """Rebuilds a session from snapshot() arrays; refresh() then only pulls the bars since it was taken."""
+        session = cls(arrays['symbols'].tolist(), date.fromisoformat(str(arrays['scan_date'])), chunk_size)
+        for i, symbol in enumerate(session.symbols):
+            state = LiveSymbol(symbol, None)
+            candles = state.candles
+            candles.ohlc[:] = arrays['ohlc'][i]
+            candles.volume[:] = arrays['volume'][i]
+            candles.timestamps[:] = arrays['timestamps'][i]
+            candles.ma[:] = arrays['ma'][i]
+            candles.size = int(arrays['size'][i])
+            candles.session_bars = int(arrays['session_bars'][i])
+            candles.volume_sum = float(arrays['volume_sum'][i])
+            candles.volume_count = int(arrays['volume_count'][i])
+            candles.ma_sum = float(arrays['ma_sum'][i])
+            state.parts = {_timestamp(ts): tuple(part) for ts, part in
+                           zip(arrays['parts_ts'][i].tolist(), arrays['parts'][i].tolist()) if ts >= 0}
+            state.last_ts = _timestamp(int(arrays['last_ts'][i]))
+            day_open, last_close = float(arrays['day_open'][i]), float(arrays['last_close'][i])
+            state.day_open = None if np.isnan(day_open) else day_open
+            state.last_close = None if np.isnan(last_close) else last_close
+            state.frozen = bool(arrays['frozen'][i])
+            state.signal = str(arrays['signal'][i]) or None
+            session.states[symbol] = state
+        return session
@@ -1,157 +1,45 @@
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
+import os
 import threading
-
-MA_WINDOW = 44
-CANDLES_BEFORE = 50
-CANDLES_START = 2
-
-def fetch_5min_data(symbol, start_date=None, end_date=None):
-    try:
-        if start_date and end_date:
-            data = yf.download(symbol, interval="5m", start=start_date, end=end_date, auto_adjust=False)
-        else:
-            data = yf.download(symbol, interval="5m", period="7d", auto_adjust=False)
-        if data.empty:
-            print(f"No data for {symbol}")
-            return None
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
-        data.index = pd.to_datetime(data.index)
-        if data.index.tz is None:
-            data.index = data.index.tz_localize('UTC').tz_convert('Asia/Kolkata')
-        else:
-            data.index = data.index.tz_convert('Asia/Kolkata')
-        data = data.sort_index()
-        data.columns = [str(col).title() for col in data.columns]
-        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-        for col in required_cols:
-            if col not in data.columns:
-                if col == 'Close' and 'Adj Close' in data.columns:
-                    data['Close'] = data['Adj Close']
-                else:
-                    print(f"Missing column {col} in data for {symbol}")
-                    return None
-        return data
-    except Exception as e:
-        print(f"Error fetching data for {symbol}: {e}")
-        return None
-
-def resample_to_10min(df):
-    df_10min = df.resample('10min', offset='15min').agg({
-        'Open': 'first',
-        'High': 'max',
-        'Low': 'min',
-        'Close': 'last',
-        'Volume': 'sum'
-    }).dropna()
-    return df_10min
-
-def fetch_historical_10min_volume(symbol, start_date, days_back=5):
-    """
-    Fetches historical 10-min candle data (including volume) for a symbol.
-    Returns a DataFrame with 10-min candles for the days before start_date.
-    """
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-    fetch_start = (start_dt - timedelta(days=days_back)).strftime("%Y-%m-%d")
-    fetch_end = start_date
-    df_5min = fetch_5min_data(symbol, fetch_start, fetch_end)
-    if df_5min is None or df_5min.empty:
-        print(f"No 5-min data for {symbol} in range {fetch_start} to {fetch_end}")
-        return None
-    df_10min = resample_to_10min(df_5min)
-    df_10min['date'] = df_10min.index.date
-    before_10min = df_10min[df_10min['date'] < start_dt].drop(columns='date')
-    return before_10min
-
-def get_44ma_on_52candles_from_date(symbol, start_date_str, data_5min=None):
-    try:
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-        prev5_date = start_date - timedelta(days=5)
-        fetch_start = prev5_date.strftime("%Y-%m-%d")
-        fetch_end = (start_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        if data_5min is None:
-            data_5min = fetch_5min_data(symbol, fetch_start, fetch_end)
-        if data_5min is None or data_5min.empty:
-            return None
-        data_10min = resample_to_10min(data_5min)
-        data_10min['date'] = data_10min.index.date
-        before_10min = data_10min[data_10min['date'] < start_date].drop(columns='date')
-        start_10min = data_10min[data_10min['date'] == start_date].drop(columns='date')
-        last50_before = before_10min.tail(CANDLES_BEFORE)
-        first2_start = start_10min.head(CANDLES_START)
-        combined_52 = pd.concat([last50_before, first2_start])
-        combined_52['MA44'] = combined_52['Close'].rolling(window=MA_WINDOW).mean()
-        return combined_52
-    except Exception as e:
-        print(f"Error in get_44ma_on_52candles_from_date for {symbol}: {e}")
-        return None
-
-def check_first2_against_ma44(df_10min, combined_52):
-    if df_10min is None or combined_52 is None or len(df_10min) < 2 or len(combined_52) < 2:
-        return "Not enough data"
-    first2 = df_10min.head(2)
-    last2_ma44 = combined_52['MA44'].tail(2)
-    if first2.isnull().any().any() or last2_ma44.isnull().any():
-        return "Not enough data"
-    green = first2['Close'] > first2['Open']
-    red = first2['Open'] > first2['Close']
-    above_ma = (first2['Low'].values > last2_ma44.values)
-    below_ma = (first2['High'].values < last2_ma44.values)
-
-    # --- Confirmation logic ---
-    def strong_body(row):
-        rng = abs(row['High'] - row['Low'])
-        body = abs(row['Close'] - row['Open'])
-        return rng > 0 and (body / rng) > 0.4
-
-    strong_bodies = first2.apply(strong_body, axis=1).all()
-    ma_slope_up = last2_ma44.iloc[1] > last2_ma44.iloc[0]
-    ma_slope_down = last2_ma44.iloc[1] < last2_ma44.iloc[0]
-    close_near_high = abs(first2.iloc[1]['Close'] - first2.iloc[1]['High']) < 0.15 * (first2.iloc[1]['High'] - first2.iloc[1]['Low'])
-    close_near_low = abs(first2.iloc[1]['Close'] - first2.iloc[1]['Low']) < 0.15 * (first2.iloc[1]['High'] - first2.iloc[1]['Low'])
-
-    if green.all() and above_ma.all():
-        if strong_bodies and ma_slope_up and close_near_high:
-            return "Confirmed Bullish"
-        return "Bullish"
-    elif red.all() and below_ma.all():
-        if strong_bodies and ma_slope_down and close_near_low:
-            return "Confirmed Bearish"
-        return "Bearish"
-    else:
-        return "No Signal"
+import time
+from metrics import get_metrics
+from results_view import ResultsView
+from service_client import ServiceClient
+from stock_list import DEFAULT_STOCKS
+from warm_start import load_results, load_session, save_results, save_session
+# scanner and live_session pull in pandas and numpy, so they are imported on first use (see _warm_up)
 
 class NSEStockScreener(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Stock Candle Screener V1")
         self.geometry("1300x600")
-        self.stocks = [
-            # ...existing stock list...
-            "ABB.NS", "ACC.NS", "APLAPOLLO.NS", "AUBANK.NS", "AARTIIND.NS", "ADANIENSOL.NS", "ADANIENT.NS","ADANIGREEN.NS", "ADANIPORTS.NS", "ATGL.NS", "ABCAPITAL.NS", "ABFRL.NS", "ALKEM.NS", "AMBUJACEM.NS",
-            "ANGELONE.NS", "APOLLOHOSP.NS", "APOLLOTYRE.NS", "ASHOKLEY.NS", "ASIANPAINT.NS", "ASTRAL.NS","AUROPHARMA.NS", "DMART.NS", "AXISBANK.NS", "BSOFT.NS", "BSE.NS", "BAJAJ-AUTO.NS", "BAJFINANCE.NS",
-            "BAJAJFINSV.NS", "BALKRISIND.NS", "BANDHANBNK.NS", "BANKBARODA.NS", "BANKINDIA.NS", "BEL.NS","BHARATFORG.NS", "BHEL.NS", "BPCL.NS", "BHARTIARTL.NS", "BIOCON.NS", "BOSCHLTD.NS", "BRITANNIA.NS","CESC.NS", "CGPOWER.NS", "CANBK.NS", "CDSL.NS", "CHAMBLFERT.NS", "CHOLAFIN.NS", "CIPLA.NS",
-            "COALINDIA.NS", "COFORGE.NS", "COLPAL.NS", "CAMS.NS", "CONCOR.NS", "CROMPTON.NS","CYIENT.NS", "DLF.NS", "DABUR.NS", "DALBHARAT.NS", "DEEPAKNTR.NS", "DELHIVERY.NS", "DIVISLAB.NS",
-            "DIXON.NS", "DRREDDY.NS", "ETERNAL.NS", "EICHERMOT.NS", "ESCORTS.NS", "EXIDEIND.NS", "NYKAA.NS","GAIL.NS", "GMRAIRPORT.NS", "GLENMARK.NS", "GODREJCP.NS", "GODREJPROP.NS", "GRANULES.NS",
-            "GRASIM.NS", "HCLTECH.NS", "HDFCAMC.NS", "HDFCBANK.NS", "HDFCLIFE.NS", "HFCL.NS", "HAVELLS.NS","HEROMOTOCO.NS", "HINDALCO.NS", "HAL.NS", "HINDCOPPER.NS", "HINDPETRO.NS", "HINDUNILVR.NS",
-            "HINDZINC.NS", "ICICIBANK.NS", "HUDCO.NS", "ICICIGI.NS", "ICICIPRULI.NS", "IDFCFIRSTB.NS","IIFL.NS", "IRB.NS", "ITC.NS", "INDIANB.NS", "IEX.NS", "IOC.NS", "IRCTC.NS", "IRFC.NS", "IREDA.NS",
-            "IGL.NS", "INDUSTOWER.NS", "INDUSINDBK.NS", "NAUKRI.NS", "INFY.NS", "INOXWIND.NS", "INDIGO.NS","JSWENERGY.NS", "JSWSTEEL.NS", "JSL.NS", "JINDALSTEL.NS", "JIOFIN.NS", "JUBLFOOD.NS", "KEI.NS",
-            "KPITTECH.NS", "KALYANKJIL.NS", "KOTAKBANK.NS", "LTF.NS", "LICHSGFIN.NS", "LTIM.NS", "LT.NS","LAURUSLABS.NS", "LICI.NS", "LUPIN.NS", "MRF.NS", "LODHA.NS", "MGL.NS", "M&MFIN.NS", "M&M.NS",
-            "MANAPPURAM.NS", "MARICO.NS", "MARUTI.NS", "MFSL.NS", "MAXHEALTH.NS", "MPHASIS.NS", "MCX.NS","MUTHOOTFIN.NS", "NBCC.NS", "NCC.NS", "NHPC.NS", "NMDC.NS", "NTPC.NS", "NATIONALUM.NS",
-            "NESTLEIND.NS", "OBEROIRLTY.NS", "ONGC.NS", "OIL.NS", "PAYTM.NS", "OFSS.NS", "POLICYBZR.NS","PIIND.NS", "PNBHOUSING.NS", "PAGEIND.NS", "PATANJALI.NS", "PERSISTENT.NS", "PETRONET.NS",
-            "PIDILITIND.NS", "PEL.NS", "POLYCAB.NS", "POONAWALLA.NS", "PFC.NS", "POWERGRID.NS", "PRESTIGE.NS","PNB.NS", "RBLBANK.NS", "RECLTD.NS", "RELIANCE.NS", "SBICARD.NS", "SBILIFE.NS", "SHREECEM.NS",
-            "SJVN.NS", "SRF.NS", "MOTHERSON.NS", "SHRIRAMFIN.NS", "SIEMENS.NS", "SOLARINDS.NS", "SONACOMS.NS","SBIN.NS", "SAIL.NS", "SUNPHARMA.NS", "SUPREMEIND.NS", "SYNGENE.NS", "TATACONSUM.NS", "TITAGARH.NS",
-            "TVSMOTOR.NS", "TATACHEM.NS", "TATACOMM.NS", "TCS.NS", "TATAELXSI.NS", "TATAMOTORS.NS","TATAPOWER.NS", "TATASTEEL.NS", "TATATECH.NS", "TECHM.NS", "FEDERALBNK.NS", "INDHOTEL.NS",
-            "PHOENIXLTD.NS", "RAMCOCEM.NS", "TORNTPHARM.NS", "TORNTPOWER.NS", "TRENT.NS", "TIINDIA.NS","UPL.NS", "ULTRACEMCO.NS", "UNIONBANK.NS", "UNITDSPR.NS", "VBL.NS", "VEDL.NS", "IDEA.NS",
-            "VOLTAS.NS", "WIPRO.NS", "YESBANK.NS", "ZYDUSLIFE.NS"
-        ]
+        self.stocks = list(DEFAULT_STOCKS)
         self.auto_refresh = False
         self.refresh_interval_ms = 60 * 1000  # 1 minute (in milliseconds)
+        self.bulk_chunk_size = None  # tickers per yf.download request; None keeps BULK_CHUNK_SIZE
+        self.live_session = None
+        self.live_lock = threading.Lock()
+        self.ui_frame_ms = 100  # streamed rows and progress are applied at most 10 times a second
+        self.ui_loop_running = False
+        self.scanning = False
+        self.progress_done = 0
+        self.progress_total = 0
+        self.shown_progress = None
+        # With a screener service running, this window only shows its results
+        service_url = os.environ.get("SCREENER_SERVICE_URL")
+        self.service = ServiceClient(service_url) if service_url else None
         self.create_widgets()
+        self.view = ResultsView(self.tree)
+        if self.service:
+            # The service pushes every change, so there is nothing to auto-refresh
+            self.auto_btn.config(state=tk.DISABLED)
+            threading.Thread(target=self._follow_service, daemon=True).start()
+        else:
+            threading.Thread(target=self._warm_up, daemon=True).start()
+            self._restore_results()
 
     def create_widgets(self):
         frame_left = tk.Frame(self)
@@ -236,179 +124,138 @@ class NSEStockScreener(tk.Tk):
         else:
             self.auto_btn.config(text="Start Auto-Refresh")
 
+    def _warm_up(self):
+        # Imported off the Tk thread so the window is up at once; a scan started
+        # before this finishes just waits for the import
+        import scanner
+        import live_session
+
+    def _restore_results(self):
+        # The last run's table stays on screen while the first fresh scan runs
+        snapshot = load_results()
+        if snapshot is None:
+            return
+        self.mode_var.set(snapshot['mode'])
+        if snapshot['mode'] == "Historical":
+            self.date_entry.insert(0, snapshot['scan_date'])
+        self.view.show(snapshot['rows'])
+        if snapshot['mode'] == "Live":
+            self.run_screener()
+
+    def _bulk_kwargs(self):
+        return {'chunk_size': self.bulk_chunk_size} if self.bulk_chunk_size else {}
+
     def run_screener(self, auto=False):
-        self.tree.delete(*self.tree.get_children())
-        self.progress['value'] = 0
-        self.progress_label.config(text="Progress: 0%")
+        # Rows stay on screen and are updated in place as the new results come in
+        self.progress_done = 0
+        self.progress_total = len(self.stocks)
+        self._show_progress(0, self.progress_total)
+        self.scanning = True
+        if not self.ui_loop_running:
+            self.ui_loop_running = True
+            self.after(self.ui_frame_ms, self._ui_frame)
         threading.Thread(target=self._run_screener_thread, args=(auto,), daemon=True).start()
 
+    def _run_live_session(self, stocks, scan_date):
+        from live_session import LiveSession
+        # Reuse today's session so each refresh only folds in the new bars
+        with self.live_lock:
+            session = self.live_session
+            if session is None:
+                session = load_session(stocks, scan_date, chunk_size=self.bulk_chunk_size)
+            if session is None or session.scan_date != scan_date or session.symbols != stocks:
+                session = LiveSession(stocks, scan_date, chunk_size=self.bulk_chunk_size)
+                session.start(on_rows=self._on_rows)
+            else:
+                session.refresh(on_rows=self._on_rows)
+            self.live_session = session
+            save_session(session)
+            return session.results()
+
+    def _on_rows(self, part_rows, done):
+        # Picked up by the next _ui_frame, however many parts arrive in between
+        self.view.push_scanned(part_rows)
+        self.progress_done = done
+
+    def _run_full_scan(self, stocks, start_date):
+        from scanner import scan_symbols
+        return scan_symbols(stocks, start_date, on_rows=self._on_rows, **self._bulk_kwargs())
+
+    def _show_progress(self, done, total):
+        percent = int(done / total * 100) if total else 0
+        if (done, total) == self.shown_progress:
+            return
+        self.shown_progress = (done, total)
+        self.progress.config(value=done, maximum=max(total, 1))
+        self.progress_label.config(text=f"Progress: {percent}%")
+
+    def _ui_frame(self):
+        with get_metrics().timer("ui_update"):
+            self.view.flush()
+            self._show_progress(self.progress_done, self.progress_total)
+        if self.scanning:
+            self.after(self.ui_frame_ms, self._ui_frame)
+        else:
+            self.ui_loop_running = False
+
+    def _follow_service(self):
+        while True:
+            try:
+                for rows in self.service.follow():
+                    self.after(0, lambda r=rows: self._show_service_rows(r))
+            except Exception as e:
+                print(f"Error following screener service: {e}")
+            time.sleep(5)
+
+    def _show_service_rows(self, rows):
+        with get_metrics().timer("ui_update"):
+            self.view.show(rows)
+            self._show_progress(len(rows), len(rows))
+
     def _run_screener_thread(self, auto=False):
+        if self.service:
+            self.scanning = False
+            try:
+                rows = self.service.results()
+            except Exception as e:
+                print(f"Error fetching results from screener service: {e}")
+                return
+            self.after(0, lambda: self._show_service_rows(rows))
+            return
+        from scanner import rank_results
+        from trading_calendar import now_ist
         mode = self.mode_var.get()
         if mode == "Historical":
             date_str = self.date_entry.get().strip()
             try:
                 date_obj = datetime.strptime(date_str, "%Y-%m-%d")
                 start_date = date_obj.strftime("%Y-%m-%d")
-                end_date = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
             except:
+                self.scanning = False
                 self.after(0, lambda: messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD."))
                 return
         else:
-            today = datetime.now().date()
+            today = now_ist().date()
             start_date = today.strftime("%Y-%m-%d")
-            end_date = (today + timedelta(days=1)).strftime("%Y-%m-%d")
-        results = []
-        pct_changes = {}
-        total = len(self.stocks)
-        for idx, symbol in enumerate(self.stocks):
-            print(f"\n----- Processing {symbol} -----")
-            df_5min = fetch_5min_data(symbol, start_date, end_date)
-            if df_5min is None or df_5min.empty:
-                signal = "No Data"
-                print(f"No data for {symbol}")
-                pct_changes[symbol] = None
-                first_open = first_close = second_open = second_close = ""
-                volume_status = ""
-            else:
-                df_10min = resample_to_10min(df_5min)
-                data_10min = df_10min.copy()
-                data_10min['date'] = data_10min.index.date
-                # Use robust historical fetch for before_10min
-                before_10min = fetch_historical_10min_volume(symbol, start_date, days_back=5)
-                start_10min = data_10min[data_10min['date'] == datetime.strptime(start_date, "%Y-%m-%d").date()].drop(columns='date')
-                avg_vol = before_10min['Volume'].mean() if before_10min is not None and not before_10min.empty else None
-                first2_start = start_10min.head(2)
-                if avg_vol is not None and len(first2_start) == 2:
-                    first2_vol_high = (first2_start['Volume'] > avg_vol).all()
-                    volume_status = "High Volume" if first2_vol_high else "Low Volume"
-                elif len(first2_start) < 2:
-                    volume_status = "No 2 Candles"
-                elif avg_vol is None:
-                    volume_status = "No Avg Vol"
-                else:
-                    volume_status = "No Data"
-                combined_52 = get_44ma_on_52candles_from_date(symbol, start_date)
-                print("\n--- First 2 Candles (10-min) ---")
-                print(df_10min.head(2)[['Open', 'High', 'Low', 'Close']])
-                print("\n--- Last 2 MA44 Values ---")
-                if combined_52 is not None:
-                    print(combined_52['MA44'].tail(2))
-                signal = check_first2_against_ma44(df_10min, combined_52)
-                print(f"Signal: {signal}")
-                if len(df_10min) >= 2:
-                    first_open = df_10min.iloc[0]['Open']
-                    first_close = df_10min.iloc[0]['Close']
-                    second_open = df_10min.iloc[1]['Open']
-                    second_close = df_10min.iloc[1]['Close']
-                elif len(df_10min) == 1:
-                    first_open = df_10min.iloc[0]['Open']
-                    first_close = df_10min.iloc[0]['Close']
-                    second_open = second_close = ""
-                else:
-                    first_open = first_close = second_open = second_close = ""
-                try:
-                    day_data = df_5min[df_5min.index.date == datetime.strptime(start_date, "%Y-%m-%d").date()]
-                    if not day_data.empty:
-                        open_price = day_data.iloc[0]['Open']
-                        close_price = day_data.iloc[-1]['Close']
-                        pct_change = ((close_price - open_price) / open_price) * 100
-                        pct_changes[symbol] = pct_change
-                    else:
-                        pct_changes[symbol] = None
-                except Exception as e:
-                    print(f"Error calculating pct_change for {symbol}: {e}")
-                    pct_changes[symbol] = None
-            results.append((symbol, first_open, first_close, second_open, second_close, signal, volume_status))
-            percent = int((idx + 1) / total * 100)
-            self.after(0, lambda p=percent: self.progress_label.config(text=f"Progress: {p}%"))
-            self.after(0, lambda v=idx+1: self.progress.config(value=v, maximum=total))
-        sorted_changes = sorted(
-            [(s, pct) for s, pct in pct_changes.items() if pct is not None],
-            key=lambda x: x[1], reverse=True)
-        top_10_gainers = set([s for s, _ in sorted_changes[:10]])
-        top_10_losers = set([s for s, _ in sorted_changes[-10:]])
-        def custom_order(symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status):
-            # High Volume first, then Low Volume, then others
-            if signal == "Confirmed Bullish" and top10 == "Gainer" and volume_status == "High Volume":
-                return 0
-            elif signal == "Confirmed Bearish" and top10 == "Loser" and volume_status == "High Volume":
-                return 1
-            elif signal == "Confirmed Bullish" and volume_status == "High Volume":
-                return 2
-            elif signal == "Confirmed Bearish" and volume_status == "High Volume":
-                return 3
-            elif signal == "Bullish" and top10 == "Gainer" and volume_status == "High Volume":
-                return 4
-            elif signal == "Bearish" and top10 == "Loser" and volume_status == "High Volume":
-                return 5
-            elif signal == "Bullish" and volume_status == "High Volume":
-                return 6
-            elif signal == "Bearish" and volume_status == "High Volume":
-                return 7
-
-            elif signal == "Confirmed Bullish" and top10 == "Gainer" and volume_status == "Low Volume":
-                 return 8
-            elif signal == "Confirmed Bearish" and top10 == "Loser" and volume_status == "Low Volume":
-                 return 9
-            elif signal == "Confirmed Bullish" and volume_status == "Low Volume":
-                 return 10
-            elif signal == "Confirmed Bearish" and volume_status == "Low Volume":
-                 return 11
-            elif signal == "Bullish" and top10 == "Gainer" and volume_status == "Low Volume":
-                 return 12
-            elif signal == "Bearish" and top10 == "Loser" and volume_status == "Low Volume":
-                 return 13
-            elif signal == "Bullish" and volume_status == "Low Volume":
-                 return 14
-            elif signal == "Bearish" and volume_status == "Low Volume":
-                 return 15
-
-            elif signal == "No Signal" and volume_status == "High Volume":
-                 return 16
-            elif signal == "No Signal":
-                 return 17
-            elif signal == "Not enough data":
-                 return 18
-            elif signal == "No Data":
-                 return 19
-            elif signal == "Fetching...":
-                 return 20
-            else:
-                 return 99
-        display_results = []
-        for symbol, first_open, first_close, second_open, second_close, signal, volume_status in results:
-            if symbol in top_10_gainers:
-                top10 = "Gainer"
-            elif symbol in top_10_losers:
-                top10 = "Loser"
-            else:
-                top10 = ""
-            display_results.append((symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status))
-        display_results.sort(key=lambda x: custom_order(*x))
+        scan_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        stocks = list(self.stocks)
+        total = len(stocks)
+        metrics = get_metrics()
+        metrics.reset()
+        if mode == "Live":
+            results, pct_changes = self._run_live_session(stocks, scan_date)
+        else:
+            results, pct_changes = self._run_full_scan(stocks, start_date)
+        display_results = rank_results(results, pct_changes)
+        save_results(display_results, mode, scan_date)
         def update_tree():
-            self.tree.delete(*self.tree.get_children())
-            for symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status in display_results:
-                item = self.tree.insert(
-                    "", tk.END,
-                    values=(
-                        symbol,
-                        f"{first_open:.2f}" if isinstance(first_open, (float, int)) else first_open,
-                        f"{first_close:.2f}" if isinstance(first_close, (float, int)) else first_close,
-                        f"{second_open:.2f}" if isinstance(second_open, (float, int)) else second_open,
-                        f"{second_close:.2f}" if isinstance(second_close, (float, int)) else second_close,
-                        signal,
-                        top10,
-                        volume_status))
-                if signal == "Bullish":
-                    self.tree.item(item, tags=("Bullish",))
-                elif signal == "Bearish":
-                    self.tree.item(item, tags=("Bearish",))
-                elif signal == "Confirmed Bullish":
-                    self.tree.item(item, tags=("Confirmed Bullish",))
-                elif signal == "Confirmed Bearish":
-                    self.tree.item(item, tags=("Confirmed Bearish",))
-            self.progress_label.config(text="Progress: 100%")
-            self.progress.config(value=total, maximum=total)
+            with metrics.timer("ui_update"):
+                self.scanning = False
+                self.view.show(display_results)
+                self._show_progress(total, total)
+            if metrics.enabled:
+                print(metrics.summary())
+                metrics.write()
         self.after(0, update_tree)
         if auto and self.auto_refresh:
             self.after(self.refresh_interval_ms, lambda: self.run_screener(auto=True))
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+
+DEFAULT_METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_metrics.json")
+# Stages in pipeline order; rate_wait and backoff are the network wait that is not a request
+STAGES = ("rate_wait", "backoff", "fetch", "resample", "panel", "ma", "signal", "ranking", "ui_update")
+NETWORK_STAGES = ("rate_wait", "backoff", "fetch")
+# Error details kept per scan; the counters still count every error
+MAX_ERRORS = 200
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'symbols', 'start')
+
+    def __init__(self, metrics, stage, symbols):
+        self.metrics = metrics
+        self.stage = stage
+        self.symbols = symbols
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_time(self.stage, time.perf_counter() - self.start, self.symbols)
+        return False
+
+class ScanMetrics:
+    """
+    Durations per stage (and per symbol where a stage runs per symbol) plus
+    counters such as cache hits, retries and failures, for one scan. Worker
+    threads record into it concurrently; reset() starts the next scan.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.perf_counter()
+            self.stages = {}  # stage -> [calls, total seconds, max seconds]
+            self.symbols = {}  # symbol -> {stage: seconds}
+            self.counters = {}
+            self.errors = []  # (counter, detail), oldest first
+
+    def timer(self, stage, symbols=None):
+        """
+        Context manager that adds its duration to stage, and to symbols (a str
+        or list); a duration shared by several symbols is split evenly among them.
+        """
+        return _Timer(self, stage, symbols)
+
+    def add_time(self, stage, seconds, symbols=None):
+        if isinstance(symbols, str):
+            symbols = (symbols,)
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            if symbols:
+                share = seconds / len(symbols)
+                for symbol in symbols:
+                    per_symbol = self.symbols.setdefault(symbol, {})
+                    per_symbol[stage] = per_symbol.get(stage, 0.0) + share
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def error(self, name, detail):
+        """Counts an error under name and keeps its detail for the metrics file."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            if len(self.errors) < MAX_ERRORS:
+                self.errors.append((name, detail))
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+            lookups = sum(counters.get(name, 0) for name in ("cache_hits", "cache_partial", "cache_misses"))
+            return {
+                'wall_sec': time.perf_counter() - self.started,
+                'stages': {stage: {'calls': calls, 'total_sec': total, 'max_sec': longest}
+                           for stage, (calls, total, longest) in self.stages.items()},
+                'counters': counters,
+                'cache_hit_rate': counters.get("cache_hits", 0) / lookups if lookups else None,
+                'symbols': {symbol: dict(stages) for symbol, stages in self.symbols.items()},
+                'errors': [{'counter': name, 'detail': detail} for name, detail in self.errors],
+            }
+
+    def merge(self, snapshot):
+        """Folds in a snapshot from another process, e.g. a backtest worker."""
+        with self._lock:
+            for stage, values in snapshot['stages'].items():
+                entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+                entry[0] += values['calls']
+                entry[1] += values['total_sec']
+                entry[2] = max(entry[2], values['max_sec'])
+            for name, n in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for symbol, stages in snapshot['symbols'].items():
+                per_symbol = self.symbols.setdefault(symbol, {})
+                for stage, seconds in stages.items():
+                    per_symbol[stage] = per_symbol.get(stage, 0.0) + seconds
+            room = MAX_ERRORS - len(self.errors)
+            self.errors.extend((error['counter'], error['detail']) for error in snapshot.get('errors', [])[:room])
+
+    def summary(self):
+        snap = self.snapshot()
+        wall = snap['wall_sec']
+        lines = [f"Scan took {wall:.2f}s ({len(snap['symbols'])} symbols)"]
+        order = [stage for stage in STAGES if stage in snap['stages']]
+        order += sorted(stage for stage in snap['stages'] if stage not in STAGES)
+        for stage in order:
+            values = snap['stages'][stage]
+            share = values['total_sec'] / wall * 100 if wall else 0.0
+            lines.append(f"  {stage:<10} {values['total_sec']:>9.3f}s {share:>6.1f}% of wall "
+                         f"{values['calls']:>6} calls  max {values['max_sec']:.3f}s")
+        network = sum(snap['stages'][stage]['total_sec'] for stage in NETWORK_STAGES if stage in snap['stages'])
+        busy = sum(values['total_sec'] for values in snap['stages'].values())
+        if busy:
+            # Downloads overlap across pipeline workers, so shares of wall time can add up to more than 100%
+            lines.append(f"  network wait is {network / busy * 100:.1f}% of recorded stage time")
+        if snap['cache_hit_rate'] is not None:
+            lines.append(f"  cache hit rate {snap['cache_hit_rate'] * 100:.1f}%")
+        if snap['counters']:
+            lines.append("  " + ", ".join(f"{name}={n}" for name, n in sorted(snap['counters'].items())))
+        return "\n".join(lines)
+
+    def write(self, path=DEFAULT_METRICS_PATH):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class NullMetrics:
+    """Drop-in for ScanMetrics when instrumentation is off: every call is a no-op."""
+
+    enabled = False
+
+    def reset(self):
+        pass
+
+    def timer(self, stage, symbols=None):
+        return _NULL_TIMER
+
+    def add_time(self, stage, seconds, symbols=None):
+        pass
+
+    def incr(self, name, n=1):
+        pass
+
+    def error(self, name, detail):
+        pass
+
+    def snapshot(self):
+        return None
+
+    def merge(self, snapshot):
+        pass
+
+    def summary(self):
+        return ""
+
+    def write(self, path=DEFAULT_METRICS_PATH):
+        pass
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """The process-wide metrics; SCREENER_METRICS=0 in the environment turns them off."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = NullMetrics() if os.environ.get("SCREENER_METRICS") == "0" else ScanMetrics()
+        return _metrics
+
+def set_metrics(metrics):
+    """Installs metrics for this process; None turns instrumentation off."""
+    global _metrics
+    with _metrics_lock:
+        _metrics = metrics if metrics is not None else NullMetrics()
@@ -0,0 +1,83 @@
+import threading
+
+SIGNAL_TAGS = ("Bullish", "Bearish", "Confirmed Bullish", "Confirmed Bearish")
+TOP10 = 6  # position of the Top 10 column in a display row
+
+def _price(value):
+    return f"{value:.2f}" if isinstance(value, (float, int)) else value
+
+def format_row(row):
+    """Returns the (values, tags) a ranked result row is displayed with."""
+    symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status = row
+    values = (symbol, _price(first_open), _price(first_close), _price(second_open), _price(second_close),
+              signal, top10, volume_status)
+    tags = (signal,) if signal in SIGNAL_TAGS else ()
+    return values, tags
+
+class ResultsView:
+    """
+    Keeps a Treeview in step with the latest results, one row per symbol (the
+    symbol is the row's iid). Only cells and tags that changed are written,
+    and rows whose rank changed are moved rather than rebuilt. Worker threads
+    push() rows as they are screened; the Tk thread applies them with flush().
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows = {}  # iid -> (values, tags) as last written to the tree
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def push(self, display_rows):
+        """Queues rows from any thread; a later push for the same symbol replaces the earlier one."""
+        with self._lock:
+            for row in display_rows:
+                self._pending[row[0]] = row
+
+    def push_scanned(self, scan_rows):
+        """
+        Queues scan rows, which lack the Top 10 column until the whole scan is
+        ranked; each keeps the Top 10 value its symbol already shows.
+        """
+        self.push([row[:TOP10] + (None,) + row[TOP10:] for row in scan_rows])
+
+    def flush(self):
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending = {}
+        self.apply(rows)
+
+    def apply(self, display_rows):
+        """Writes rows in place; symbols not shown yet are appended."""
+        for row in display_rows:
+            values, tags = format_row(row)
+            iid = values[0]
+            shown = self.rows.get(iid)
+            if values[TOP10] is None:
+                values = values[:TOP10] + (shown[0][TOP10] if shown else "",) + values[TOP10 + 1:]
+            if shown is None:
+                self.tree.insert("", "end", iid=iid, values=values, tags=tags)
+            else:
+                if shown[0] != values:
+                    self.tree.item(iid, values=values)
+                if shown[1] != tags:
+                    self.tree.item(iid, tags=tags)
+            self.rows[iid] = (values, tags)
+
+    def show(self, display_rows):
+        """Makes the table exactly display_rows, in that order, touching only what differs."""
+        with self._lock:
+            self._pending = {}
+        self.apply(display_rows)
+        order = [row[0] for row in display_rows]
+        stale = set(self.rows) - set(order)
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self.rows[iid]
+        current = list(self.tree.get_children())
+        for index, iid in enumerate(order):
+            if current[index] != iid:
+                self.tree.move(iid, "", index)
+                current.remove(iid)
+                current.insert(index, iid)
@@ -0,0 +1,145 @@
+from datetime import datetime
+
+from metrics import get_metrics
+from screener_core import BULK_CHUNK_SIZE, load_scan_data_bulk, split_10min_by_date, volume_status_from
+from signal_engine import evaluate_signals
+
+def scan_symbols(symbols, start_date, chunk_size=BULK_CHUNK_SIZE, on_rows=None):
+    """
+    Full scan of symbols for one trading day (YYYY-MM-DD), shared by the Tk
+    window and the headless CLI. Returns (results, pct_changes) where each
+    result is (symbol, first_open, first_close, second_open, second_close,
+    signal, volume_status). on_rows(part_rows, done) is called as each
+    download part is screened.
+    """
+    symbols = list(symbols)
+    scan_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+    metrics = get_metrics()
+    rows = {}
+    pct_changes = {}
+
+    def on_part(part):
+        part_rows = []
+        candles = {}
+        for symbol, (df_5min, data_10min) in part.items():
+            if df_5min is not None:
+                df_5min = df_5min[df_5min.index.date == scan_date]
+            if df_5min is None or df_5min.empty:
+                signal = "No Data"
+                metrics.incr("no_data")
+                pct_changes[symbol] = None
+                first_open = first_close = second_open = second_close = ""
+                volume_status = ""
+            else:
+                # One download and one resample feed the volume, MA44 and first-two-candle stages
+                before_10min, df_10min = split_10min_by_date(data_10min, scan_date)
+                avg_vol = before_10min['Volume'].mean() if not before_10min.empty else None
+                volume_status = volume_status_from(avg_vol, df_10min['Volume'].head(2).tolist())
+                candles[symbol] = (before_10min, df_10min)
+                signal = None
+                if len(df_10min) >= 2:
+                    first_open = df_10min.iloc[0]['Open']
+                    first_close = df_10min.iloc[0]['Close']
+                    second_open = df_10min.iloc[1]['Open']
+                    second_close = df_10min.iloc[1]['Close']
+                elif len(df_10min) == 1:
+                    first_open = df_10min.iloc[0]['Open']
+                    first_close = df_10min.iloc[0]['Close']
+                    second_open = second_close = ""
+                else:
+                    first_open = first_close = second_open = second_close = ""
+                try:
+                    if not df_5min.empty:
+                        open_price = df_5min.iloc[0]['Open']
+                        close_price = df_5min.iloc[-1]['Close']
+                        pct_change = ((close_price - open_price) / open_price) * 100
+                        pct_changes[symbol] = pct_change
+                    else:
+                        pct_changes[symbol] = None
+                except Exception as e:
+                    metrics.error("bad_frames", f"{symbol}: pct change: {e}")
+                    pct_changes[symbol] = None
+            part_rows.append((symbol, first_open, first_close, second_open, second_close, signal, volume_status))
+        # MA44 and the first-two-candle checks run once per completed batch
+        signals = evaluate_signals(candles)
+        part_rows = [(symbol, first_open, first_close, second_open, second_close, signals.get(symbol, signal), volume_status)
+                     for symbol, first_open, first_close, second_open, second_close, signal, volume_status in part_rows]
+        rows.update((row[0], row) for row in part_rows)
+        if on_rows:
+            on_rows(part_rows, len(rows))
+
+    load_scan_data_bulk(symbols, start_date, chunk_size=chunk_size, on_result=on_part)
+    results = [rows.get(symbol, (symbol, "", "", "", "", "No Data", "")) for symbol in symbols]
+    return results, pct_changes
+
+def custom_order(symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status):
+    # High Volume first, then Low Volume, then others
+    if signal == "Confirmed Bullish" and top10 == "Gainer" and volume_status == "High Volume":
+        return 0
+    elif signal == "Confirmed Bearish" and top10 == "Loser" and volume_status == "High Volume":
+        return 1
+    elif signal == "Confirmed Bullish" and volume_status == "High Volume":
+        return 2
+    elif signal == "Confirmed Bearish" and volume_status == "High Volume":
+        return 3
+    elif signal == "Bullish" and top10 == "Gainer" and volume_status == "High Volume":
+        return 4
+    elif signal == "Bearish" and top10 == "Loser" and volume_status == "High Volume":
+        return 5
+    elif signal == "Bullish" and volume_status == "High Volume":
+        return 6
+    elif signal == "Bearish" and volume_status == "High Volume":
+        return 7
+
+    elif signal == "Confirmed Bullish" and top10 == "Gainer" and volume_status == "Low Volume":
+         return 8
+    elif signal == "Confirmed Bearish" and top10 == "Loser" and volume_status == "Low Volume":
+         return 9
+    elif signal == "Confirmed Bullish" and volume_status == "Low Volume":
+         return 10
+    elif signal == "Confirmed Bearish" and volume_status == "Low Volume":
+         return 11
+    elif signal == "Bullish" and top10 == "Gainer" and volume_status == "Low Volume":
+         return 12
+    elif signal == "Bearish" and top10 == "Loser" and volume_status == "Low Volume":
+         return 13
+    elif signal == "Bullish" and volume_status == "Low Volume":
+         return 14
+    elif signal == "Bearish" and volume_status == "Low Volume":
+         return 15
+
+    elif signal == "No Signal" and volume_status == "High Volume":
+         return 16
+    elif signal == "No Signal":
+         return 17
+    elif signal == "Not enough data":
+         return 18
+    elif signal == "No Data":
+         return 19
+    elif signal == "Fetching...":
+         return 20
+    else:
+         return 99
+
+def rank_results(results, pct_changes):
+    """Adds the Top 10 gainer/loser column and sorts rows by custom_order."""
+    with get_metrics().timer("ranking"):
+        return _rank_results(results, pct_changes)
+
+def _rank_results(results, pct_changes):
+    sorted_changes = sorted(
+        [(s, pct) for s, pct in pct_changes.items() if pct is not None],
+        key=lambda x: x[1], reverse=True)
+    top_10_gainers = set([s for s, _ in sorted_changes[:10]])
+    top_10_losers = set([s for s, _ in sorted_changes[-10:]])
+    display_results = []
+    for symbol, first_open, first_close, second_open, second_close, signal, volume_status in results:
+        if symbol in top_10_gainers:
+            top10 = "Gainer"
+        elif symbol in top_10_losers:
+            top10 = "Loser"
+        else:
+            top10 = ""
+        display_results.append((symbol, first_open, first_close, second_open, second_close, signal, top10, volume_status))
+    display_results.sort(key=lambda x: custom_order(*x))
+    return display_results
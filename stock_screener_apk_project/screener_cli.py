@@ -0,0 +1,205 @@
+"""
+Headless entry point for the screener.
+
+    python -m screener_cli scan --date 2024-05-15 --output signals.csv
+    python -m screener_cli backtest --from 2024-04-01 --to 2024-05-31 --output signals.parquet
+    python -m screener_cli sweep --from 2024-04-01 --to 2024-05-31 --ma 20,44,50 --bars 5,10,15
+    python -m screener_cli serve --port 8765
+
+Both commands run the same scan as the Tk window (scanner.scan_symbols and
+rank_results). backtest fans the date x symbol grid out over a process pool
+and writes one table ordered by date, then by custom_order. sweep loads the
+range once and writes signal counts and hit rates for every combination of
+MA window, bar size and thresholds. serve runs the scan loop once for any
+number of clients (see screener_service). A per-stage timing summary goes
+to stderr, and to a JSON file with --metrics.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from candle_cache import DEFAULT_CACHE_PATH, CandleCache, set_candle_cache
+from data_providers import DOWNLOAD_THREADS, ReplayProvider, YahooProvider, set_data_provider
+from fetch_pipeline import MAX_WORKERS, RATE_PER_SEC, FetchPipeline, set_fetch_pipeline
+from metrics import ScanMetrics, get_metrics, set_metrics
+from scanner import rank_results, scan_symbols
+from screener_core import BULK_CHUNK_SIZE
+from screener_service import REFRESH_INTERVAL_SEC, serve
+from stock_list import DEFAULT_STOCKS
+from sweep import BAR_SIZES, BODY_RATIOS, CLOSE_NEAR_EXTREMES, MA_WINDOWS, sweep_symbols
+from trading_calendar import get_trading_calendar, now_ist
+
+COLUMNS = ["Date", "Symbol", "1st Open", "1st Close", "2nd Open", "2nd Close",
+           "Signal", "Top 10", "Volume Status", "Pct Change"]
+SYMBOLS_PER_TASK = 50
+
+def configure(provider=None, cache_path=DEFAULT_CACHE_PATH, max_workers=MAX_WORKERS, rate_per_sec=RATE_PER_SEC,
+              metrics=True):
+    """
+    Installs the data provider, candle cache (None disables it), fetch pipeline
+    and metrics (False turns instrumentation off) for this process.
+    """
+    if provider is not None:
+        set_data_provider(provider)
+    set_candle_cache(CandleCache(cache_path) if cache_path else None)
+    set_fetch_pipeline(FetchPipeline(max_workers=max_workers, rate_per_sec=rate_per_sec))
+    set_metrics(ScanMetrics() if metrics else None)
+
+def _scan_task(date_str, symbols, chunk_size):
+    metrics = get_metrics()
+    metrics.reset()
+    results, pct_changes = scan_symbols(symbols, date_str, chunk_size=chunk_size)
+    return date_str, results, pct_changes, metrics.snapshot()
+
+def trading_days(from_date, to_date):
+    first = datetime.strptime(from_date, "%Y-%m-%d").date()
+    last = datetime.strptime(to_date, "%Y-%m-%d").date()
+    return [day.strftime("%Y-%m-%d") for day in get_trading_calendar().trading_days(first, last)]
+
+def signals_table(scans):
+    """scans maps date -> (results, pct_changes); ranks each date and stacks them."""
+    rows = []
+    for date_str in sorted(scans):
+        results, pct_changes = scans[date_str]
+        for row in rank_results(results, pct_changes):
+            rows.append((date_str,) + row + (pct_changes.get(row[0]),))
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+def run_scan(symbols, date_str, chunk_size=BULK_CHUNK_SIZE):
+    return signals_table({date_str: scan_symbols(symbols, date_str, chunk_size=chunk_size)})
+
+def run_backtest(symbols, dates, processes=None, symbols_per_task=SYMBOLS_PER_TASK,
+                 chunk_size=BULK_CHUNK_SIZE, rate_per_sec=RATE_PER_SEC, provider=None, cache_path=DEFAULT_CACHE_PATH):
+    processes = processes or os.cpu_count() or 1
+    metrics = get_metrics()
+    tasks = [(date_str, symbols[i:i + symbols_per_task])
+             for date_str in dates for i in range(0, len(symbols), symbols_per_task)]
+    scans = {date_str: ([], {}) for date_str in dates}
+    # spawn, not fork: workers must not inherit the parent's SQLite connection or threads
+    context = multiprocessing.get_context("spawn")
+    # Each process gets its own pipeline; the rate is split so the pool as a whole stays under rate_per_sec
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=configure,
+                             initargs=(provider, cache_path, MAX_WORKERS, rate_per_sec / processes,
+                                       metrics.enabled)) as pool:
+        futures = [pool.submit(_scan_task, date_str, chunk, chunk_size) for date_str, chunk in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            date_str, results, pct_changes, snapshot = future.result()
+            if snapshot:
+                metrics.merge(snapshot)
+            scans[date_str][0].extend(results)
+            scans[date_str][1].update(pct_changes)
+            print(f"[{done}/{len(tasks)}] {date_str}: {len(results)} symbols", file=sys.stderr)
+    # Tasks finish in any order; ranking ties keep input order, so restore it for a reproducible table
+    position = {symbol: i for i, symbol in enumerate(symbols)}
+    for results, _ in scans.values():
+        results.sort(key=lambda row: position[row[0]])
+    return signals_table(scans)
+
+def write_table(frame, path):
+    if path is None:
+        print(frame.to_string(index=False))
+    elif path.endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+def _date(value):
+    datetime.strptime(value, "%Y-%m-%d")
+    return value
+
+def _ints(value):
+    return [int(v) for v in value.split(",")]
+
+def _floats(value):
+    return [float(v) for v in value.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="screener_cli", description="Headless NSE first-two-candle screener.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--symbols", help="comma-separated symbols (default: the F&O list)")
+    common.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="tickers per download request")
+    common.add_argument("--output", help="CSV or .parquet file (default: print to stdout)")
+    common.add_argument("--provider", choices=["yahoo", "replay"], default="yahoo")
+    common.add_argument("--threads", type=int, default=DOWNLOAD_THREADS,
+                        help="concurrent requests inside each yahoo download")
+    common.add_argument("--replay-dir", help="replay <SYMBOL>.csv/.parquet files instead of generated bars")
+    common.add_argument("--seed", type=int, default=0, help="replay generator seed")
+    common.add_argument("--latency", type=float, default=0.0, help="replay delay per request, seconds")
+    common.add_argument("--jitter", type=float, default=0.0, help="replay extra random delay, seconds")
+    common.add_argument("--failure-rate", type=float, default=0.0, help="replay share of failed requests")
+    common.add_argument("--ticker-failure-rate", type=float, default=0.0, help="replay share of dropped tickers")
+    common.add_argument("--cache", default=None,
+                        help="candle cache file (default: the app cache for yahoo, none for replay)")
+    common.add_argument("--no-cache", action="store_true")
+    common.add_argument("--metrics", help="write per-stage timings and counters to this JSON file")
+    common.add_argument("--no-metrics", action="store_true", help="turn instrumentation off")
+    commands = parser.add_subparsers(dest="command", required=True)
+    scan = commands.add_parser("scan", parents=[common], help="screen one trading day")
+    scan.add_argument("--date", type=_date, default=now_ist().strftime("%Y-%m-%d"))
+    backtest = commands.add_parser("backtest", parents=[common], help="screen every trading day in a range")
+    backtest.add_argument("--from", dest="from_date", type=_date, required=True)
+    backtest.add_argument("--to", dest="to_date", type=_date, required=True)
+    backtest.add_argument("--processes", type=int, default=os.cpu_count())
+    backtest.add_argument("--symbols-per-task", type=int, default=SYMBOLS_PER_TASK)
+    backtest.add_argument("--rate", type=float, default=RATE_PER_SEC, help="ticker requests per second, whole pool")
+    sweep = commands.add_parser("sweep", parents=[common], help="compare signal settings over a range of days")
+    sweep.add_argument("--from", dest="from_date", type=_date, required=True)
+    sweep.add_argument("--to", dest="to_date", type=_date, required=True)
+    sweep.add_argument("--ma", type=_ints, default=list(MA_WINDOWS), help="MA windows, e.g. 20,44,50")
+    sweep.add_argument("--bars", type=_ints, default=list(BAR_SIZES), help="bar sizes in minutes, e.g. 5,10,15")
+    sweep.add_argument("--body", type=_floats, default=list(BODY_RATIOS), help="body/range ratios")
+    sweep.add_argument("--close", type=_floats, default=list(CLOSE_NEAR_EXTREMES),
+                       help="close-near-high/low factors")
+    service = commands.add_parser("serve", parents=[common], help="share one scan loop over HTTP")
+    service.add_argument("--host", default="127.0.0.1")
+    service.add_argument("--port", type=int, default=8765)
+    service.add_argument("--interval", type=float, default=REFRESH_INTERVAL_SEC, help="seconds between scans")
+    service.add_argument("--date", type=_date, help="serve one historical day instead of today's live session")
+    args = parser.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",")] if args.symbols else list(DEFAULT_STOCKS)
+    if args.provider == "replay":
+        provider = ReplayProvider(args.replay_dir, seed=args.seed, latency=args.latency, jitter=args.jitter,
+                                  failure_rate=args.failure_rate, ticker_failure_rate=args.ticker_failure_rate)
+        # Replayed bars must never land in the real candle cache
+        cache_path = args.cache
+    else:
+        provider = YahooProvider(threads=args.threads)
+        cache_path = args.cache or DEFAULT_CACHE_PATH
+    if args.no_cache:
+        cache_path = None
+    if args.command == "scan":
+        configure(provider, cache_path, metrics=not args.no_metrics)
+        table = run_scan(symbols, args.date, args.chunk_size)
+    elif args.command == "serve":
+        configure(provider, cache_path, metrics=not args.no_metrics)
+        serve(symbols, args.host, args.port, args.date, args.interval, args.chunk_size)
+        return 0
+    elif args.command == "sweep":
+        configure(provider, cache_path, metrics=not args.no_metrics)
+        days = [datetime.strptime(day, "%Y-%m-%d").date() for day in trading_days(args.from_date, args.to_date)]
+        if not days:
+            parser.error("no trading days in the requested range")
+        table = sweep_symbols(symbols, days, args.bars, args.ma, args.body, args.close, args.chunk_size)
+    else:
+        dates = trading_days(args.from_date, args.to_date)
+        if not dates:
+            parser.error("no trading days in the requested range")
+        set_metrics(None if args.no_metrics else ScanMetrics())
+        table = run_backtest(symbols, dates, args.processes, args.symbols_per_task, args.chunk_size, args.rate,
+                             provider, cache_path)
+    write_table(table, args.output)
+    metrics = get_metrics()
+    if metrics.enabled:
+        print(metrics.summary(), file=sys.stderr)
+        if args.metrics:
+            metrics.write(args.metrics)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+import pandas as pd
+from datetime import datetime, timedelta
+from candle_cache import get_candle_cache
+from data_providers import get_data_provider
+from fetch_pipeline import FetchError, get_fetch_pipeline
+from metrics import get_metrics
+from trading_calendar import IST, SESSION_OPEN, get_trading_calendar, now_ist
+
+MA_WINDOW = 44
+CANDLES_BEFORE = 50
+CANDLES_START = 2
+BODY_RATIO = 0.4
+CLOSE_NEAR_EXTREME = 0.15
+BULK_CHUNK_SIZE = 50
+VOLUME_AVG_SESSIONS = 3  # prior sessions the first-two-candle volume is compared against
+
+def normalize_5min_frame(data, symbol):
+    if data is None or data.empty:
+        return None
+    data.index = pd.to_datetime(data.index)
+    if data.index.tz is None:
+        data.index = data.index.tz_localize('UTC').tz_convert(IST)
+    else:
+        data.index = data.index.tz_convert(IST)
+    data = data.sort_index()
+    data.columns = [str(col).title() for col in data.columns]
+    required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+    for col in required_cols:
+        if col not in data.columns:
+            if col == 'Close' and 'Adj Close' in data.columns:
+                data['Close'] = data['Adj Close']
+            else:
+                get_metrics().error("bad_frames", f"{symbol}: missing column {col}")
+                return None
+    return data
+
+def _download_5min(tickers, start_date=None, end_date=None, **kwargs):
+    return get_data_provider().download(tickers, start_date, end_date, **kwargs)
+
+def fetch_5min_data(symbol, start_date=None, end_date=None):
+    if start_date and end_date and get_candle_cache() is not None:
+        return fetch_5min_data_bulk([symbol], start_date, end_date)[symbol]
+    try:
+        with get_metrics().timer("fetch", symbol):
+            data = _download_5min(symbol, start_date, end_date)
+        if data.empty:
+            get_metrics().incr("no_data")
+            return None
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return normalize_5min_frame(data, symbol)
+    except Exception as e:
+        get_metrics().error("request_failures", f"{symbol}: {e}")
+        return None
+
+def split_multi_ticker_frame(data, symbols):
+    """
+    Splits a multi-ticker yf.download result into one OHLCV frame per symbol.
+    The ticker may sit on either column level depending on group_by.
+    """
+    frames = {}
+    for symbol in symbols:
+        sub = None
+        if data is not None and not data.empty:
+            if isinstance(data.columns, pd.MultiIndex):
+                for level in range(data.columns.nlevels):
+                    if symbol in data.columns.get_level_values(level):
+                        sub = data.xs(symbol, axis=1, level=level)
+                        break
+            elif len(symbols) == 1:
+                sub = data
+        if sub is not None:
+            # Multi-ticker frames share one index, so drop bars this symbol did not trade
+            sub = sub.dropna(how='all').copy()
+        frames[symbol] = normalize_5min_frame(sub, symbol)
+    return frames
+
+def _chunks(symbols, chunk_size):
+    return [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+def _request_windows(start_date, end_date):
+    """
+    Splits a download range into (start, end) pieces no longer than the
+    provider allows per request, skipping spans without a trading session.
+    An intraday start (the open session's tail) is kept as is.
+    """
+    if not (start_date and end_date):
+        return [(start_date, end_date)]
+    start_day = pd.Timestamp(start_date).date()
+    end_day = pd.Timestamp(end_date).date()
+    max_days = getattr(get_data_provider(), 'max_days', None)
+    windows = get_trading_calendar().split_range(start_day, end_day, max_days)
+    return [(start_date if first == start_day else first.strftime("%Y-%m-%d"),
+             end_date if last == end_day else last.strftime("%Y-%m-%d"))
+            for first, last in windows]
+
+def _fetch_chunk(chunk, start_date, end_date, timeout=None):
+    """
+    One multi-ticker download, split into provider-sized requests for long
+    ranges. Raises FetchError when nothing came back so the pipeline retries
+    the chunk; tickers without data are reported as failed.
+    """
+    parts = []
+    for i, (start, end) in enumerate(_request_windows(start_date, end_date)):
+        if i:
+            # The pipeline took tokens for the first request; the rest wait for their own
+            get_fetch_pipeline().bucket.acquire(len(chunk))
+        data = _download_5min(chunk, start, end, timeout=timeout, group_by="ticker")
+        if data is not None and not data.empty:
+            parts.append(data)
+    if not parts:
+        raise FetchError(f"empty response for {', '.join(chunk)}")
+    data = pd.concat(parts) if len(parts) > 1 else parts[0]
+    frames = split_multi_ticker_frame(data, chunk)
+    failed = [symbol for symbol in chunk if frames[symbol] is None]
+    return frames, failed
+
+def _plan_cached_fetch(cache, symbol, start_day, end_day, now):
+    """
+    Returns (fetch_start, days) for the part of [start_day, end_day) that is not
+    final in the cache, or (None, []) when the whole range can be served from disk.
+    """
+    today = now.date()
+    last_day = min(end_day, today + timedelta(days=1))
+    done = cache.complete_days(symbol, start_day, last_day)
+    # Weekends and listed holidays are never fetched
+    missing = get_trading_calendar().trading_days(start_day, last_day - timedelta(days=1))
+    missing = [day for day in missing if day not in done]
+    if not missing:
+        return None, []
+    if missing == [today]:
+        # Only the open session is missing: fetch from the last stored bar onwards
+        last_ts = cache.last_timestamp(symbol, today)
+        if last_ts is not None:
+            return last_ts, missing
+    return pd.Timestamp(missing[0]).tz_localize(IST), missing
+
+def fetch_5min_data_bulk(symbols, start_date=None, end_date=None, chunk_size=BULK_CHUNK_SIZE, on_result=None):
+    """
+    Downloads 5-min data for many symbols, chunk_size tickers per request,
+    through the shared fetch pipeline. Returns {symbol: DataFrame or None} with
+    the same normalisation as fetch_5min_data; on_result receives each
+    completed part of that dict as soon as it is ready.
+    With a date range and the candle cache enabled, final sessions are read
+    from disk and only the missing days (or the open session's tail) are fetched.
+    """
+    symbols = list(symbols)
+    pipeline = get_fetch_pipeline()
+    cache = get_candle_cache() if start_date and end_date else None
+    if cache is None:
+        def fetch_unit(chunk, timeout):
+            return _fetch_chunk(chunk, start_date, end_date, timeout)
+        return pipeline.run(_chunks(symbols, chunk_size), fetch_unit, on_result)
+    start_day = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end_day = datetime.strptime(end_date, "%Y-%m-%d").date()
+    now = now_ist()
+
+    def load_cached(chunk):
+        frames = {}
+        for symbol in chunk:
+            frames[symbol] = cache.load(symbol, start_day, end_day)
+        return frames
+
+    metrics = get_metrics()
+    groups = {}
+    missing_by_symbol = {}
+    for symbol in symbols:
+        fetch_start, missing = _plan_cached_fetch(cache, symbol, start_day, end_day, now)
+        if fetch_start is not None:
+            groups.setdefault(fetch_start.date(), []).append((symbol, fetch_start))
+            missing_by_symbol[symbol] = missing
+            # A partial hit only re-fetches the open session
+            metrics.incr("cache_partial" if missing == [now.date()] else "cache_misses")
+        else:
+            metrics.incr("cache_hits")
+    frames = {}
+    cached = [symbol for symbol in symbols if symbol not in missing_by_symbol]
+    if cached:
+        frames.update(load_cached(cached))
+        if on_result:
+            on_result(dict(frames))
+    units = []
+    start_by_symbol = {}
+    for entries in groups.values():
+        fetch_start = min(start for _, start in entries)
+        if fetch_start == fetch_start.normalize():
+            fetch_start = fetch_start.strftime("%Y-%m-%d")
+        group_symbols = [symbol for symbol, _ in entries]
+        start_by_symbol.update((symbol, fetch_start) for symbol in group_symbols)
+        units.extend(_chunks(group_symbols, chunk_size))
+
+    def fetch_unit(chunk, timeout):
+        chunk_frames, failed = _fetch_chunk(chunk, start_by_symbol[chunk[0]], end_date, timeout)
+        # A day with no bars for any ticker in the chunk is a market holiday;
+        # a day missing for just one ticker stays unmarked and is fetched again
+        days_by_symbol = {symbol: set(frame.index.date) if frame is not None else set()
+                          for symbol, frame in chunk_frames.items()}
+        traded_days = set().union(*days_by_symbol.values())
+        ok = [symbol for symbol in chunk if symbol not in failed]
+        for symbol in ok:
+            fetched = [day for day in missing_by_symbol[symbol]
+                       if day in days_by_symbol[symbol] or day not in traded_days]
+            cache.store(symbol, chunk_frames[symbol], fetched, now)
+        return load_cached(ok), failed
+
+    # Symbols that exhaust their retries still get whatever the cache holds
+    frames.update(pipeline.run(units, fetch_unit, on_result, on_give_up=load_cached))
+    return frames
+
+def resample_to_10min(df):
+    return resample_bars(df, 10)
+
+def resample_bars(df, bar_minutes):
+    """Resamples 5-min bars to bar_minutes bars, with bins starting at the 09:15 session open."""
+    offset = (SESSION_OPEN[0] * 60 + SESSION_OPEN[1]) % bar_minutes
+    return df.resample(f'{bar_minutes}min', offset=f'{offset}min').agg({
+        'Open': 'first',
+        'High': 'max',
+        'Low': 'min',
+        'Close': 'last',
+        'Volume': 'sum'
+    }).dropna()
+
+def plan_scan_window(start_date_str, sessions_back=VOLUME_AVG_SESSIONS):
+    """
+    Returns the (fetch_start, fetch_end) window that covers every stage of a
+    scan for start_date_str: the CANDLES_BEFORE 10-min bars behind the MA44,
+    the sessions_back prior sessions of the volume average and the session
+    itself. Only trading sessions count, so Mondays and post-holiday scans
+    reach back past the closed days instead of coming up short.
+    """
+    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+    first_day, end_day = get_trading_calendar().plan_window(start_date, CANDLES_BEFORE, bar_minutes=10,
+                                                            min_sessions=sessions_back)
+    return first_day.strftime("%Y-%m-%d"), end_day.strftime("%Y-%m-%d")
+
+def load_scan_data(symbol, start_date_str, sessions_back=VOLUME_AVG_SESSIONS):
+    """
+    Downloads the planned scan window for a symbol once and resamples it once.
+    Returns (df_5min, data_10min), or (None, None) when there is no data.
+    """
+    fetch_start, fetch_end = plan_scan_window(start_date_str, sessions_back)
+    df_5min = fetch_5min_data(symbol, fetch_start, fetch_end)
+    if df_5min is None or df_5min.empty:
+        return None, None
+    return df_5min, resample_to_10min(df_5min)
+
+def load_scan_data_bulk(symbols, start_date_str, sessions_back=VOLUME_AVG_SESSIONS, chunk_size=BULK_CHUNK_SIZE,
+                        on_result=None):
+    """
+    Bulk variant of load_scan_data: every symbol in a scan shares the same
+    window, so the universe is downloaded in chunks of tickers per request.
+    Returns {symbol: (df_5min, data_10min)}; on_result receives each part of
+    it as its download completes.
+    """
+    fetch_start, fetch_end = plan_scan_window(start_date_str, sessions_back)
+    metrics = get_metrics()
+    scan_data = {}
+
+    def resample_part(frames):
+        part = {}
+        for symbol, df_5min in frames.items():
+            if df_5min is None or df_5min.empty:
+                part[symbol] = (None, None)
+            else:
+                with metrics.timer("resample", symbol):
+                    part[symbol] = (df_5min, resample_to_10min(df_5min))
+        scan_data.update(part)
+        if on_result:
+            on_result(part)
+
+    fetch_5min_data_bulk(symbols, fetch_start, fetch_end, chunk_size, on_result=resample_part)
+    return scan_data
+
+def split_10min_by_date(data_10min, start_date):
+    dates = data_10min.index.date
+    return data_10min[dates < start_date], data_10min[dates == start_date]
+
+def volume_status_from(avg_vol, first2_volumes):
+    if avg_vol is not None and len(first2_volumes) == 2:
+        first2_vol_high = all(vol > avg_vol for vol in first2_volumes)
+        return "High Volume" if first2_vol_high else "Low Volume"
+    elif len(first2_volumes) < 2:
+        return "No 2 Candles"
+    elif avg_vol is None:
+        return "No Avg Vol"
+    return "No Data"
+
+def fetch_historical_10min_volume(symbol, start_date, sessions_back=VOLUME_AVG_SESSIONS, data_10min=None):
+    """
+    Fetches historical 10-min candle data (including volume) for a symbol.
+    Returns a DataFrame with 10-min candles for the sessions_back trading
+    sessions before start_date. Pass data_10min from load_scan_data to reuse
+    an already resampled window.
+    """
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+    if data_10min is None:
+        prior = get_trading_calendar().sessions_before(start_dt, sessions_back)
+        fetch_start = (prior[0] if prior else start_dt).strftime("%Y-%m-%d")
+        fetch_end = start_date
+        df_5min = fetch_5min_data(symbol, fetch_start, fetch_end)
+        if df_5min is None or df_5min.empty:
+            return None
+        data_10min = resample_to_10min(df_5min)
+    before_10min, _ = split_10min_by_date(data_10min, start_dt)
+    return before_10min
+
+def get_44ma_on_52candles_from_date(symbol, start_date_str, data_5min=None, data_10min=None):
+    try:
+        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        if data_10min is None:
+            if data_5min is None:
+                fetch_start, fetch_end = plan_scan_window(start_date_str)
+                data_5min = fetch_5min_data(symbol, fetch_start, fetch_end)
+            if data_5min is None or data_5min.empty:
+                return None
+            data_10min = resample_to_10min(data_5min)
+        before_10min, start_10min = split_10min_by_date(data_10min, start_date)
+        last50_before = before_10min.tail(CANDLES_BEFORE)
+        first2_start = start_10min.head(CANDLES_START)
+        combined_52 = pd.concat([last50_before, first2_start])
+        combined_52['MA44'] = combined_52['Close'].rolling(window=MA_WINDOW).mean()
+        return combined_52
+    except Exception as e:
+        get_metrics().error("bad_frames", f"{symbol}: {e}")
+        return None
+
+def check_first2_against_ma44(df_10min, combined_52):
+    if df_10min is None or combined_52 is None or len(df_10min) < 2 or len(combined_52) < 2:
+        return "Not enough data"
+    first2 = df_10min.head(2)
+    last2_ma44 = combined_52['MA44'].tail(2)
+    if first2.isnull().any().any() or last2_ma44.isnull().any():
+        return "Not enough data"
+    green = first2['Close'] > first2['Open']
+    red = first2['Open'] > first2['Close']
+    above_ma = (first2['Low'].values > last2_ma44.values)
+    below_ma = (first2['High'].values < last2_ma44.values)
+
+    # --- Confirmation logic ---
+    def strong_body(row):
+        rng = abs(row['High'] - row['Low'])
+        body = abs(row['Close'] - row['Open'])
+        return rng > 0 and (body / rng) > BODY_RATIO
+
+    strong_bodies = first2.apply(strong_body, axis=1).all()
+    ma_slope_up = last2_ma44.iloc[1] > last2_ma44.iloc[0]
+    ma_slope_down = last2_ma44.iloc[1] < last2_ma44.iloc[0]
+    close_near_high = abs(first2.iloc[1]['Close'] - first2.iloc[1]['High']) < CLOSE_NEAR_EXTREME * (first2.iloc[1]['High'] - first2.iloc[1]['Low'])
+    close_near_low = abs(first2.iloc[1]['Close'] - first2.iloc[1]['Low']) < CLOSE_NEAR_EXTREME * (first2.iloc[1]['High'] - first2.iloc[1]['Low'])
+
+    if green.all() and above_ma.all():
+        if strong_bodies and ma_slope_up and close_near_high:
+            return "Confirmed Bullish"
+        return "Bullish"
+    elif red.all() and below_ma.all():
+        if strong_bodies and ma_slope_down and close_near_low:
+            return "Confirmed Bearish"
+        return "Bearish"
+    else:
+        return "No Signal"
@@ -0,0 +1,220 @@
+"""
+Local screener service: one scan loop shared by any number of clients.
+
+    python -m screener_cli serve --port 8765
+    SCREENER_SERVICE_URL=http://127.0.0.1:8765 python main.py
+
+The service runs the same live session (or a single historical scan) as the
+Tk window on a fixed interval and publishes every ranked result over plain
+HTTP, using only the standard library:
+
+    GET /results  the latest snapshot as JSON
+    GET /events   Server-Sent Events: a "snapshot" event, then a "changes"
+                  event per scan with only the rows that changed, the rows
+                  that were removed and the new order when the ranking moved
+    GET /metrics  timings and counters of the last scan
+    GET /health   liveness
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from candle_cache import CLOSE_GRACE
+from live_session import LiveSession
+from metrics import get_metrics
+from scanner import rank_results, scan_symbols
+from screener_core import BULK_CHUNK_SIZE
+from trading_calendar import get_trading_calendar, now_ist
+
+REFRESH_INTERVAL_SEC = 60
+KEEPALIVE_SEC = 15
+SUBSCRIBER_QUEUE = 100  # events a slow client may lag behind before it is dropped
+
+def _json_row(row):
+    return [value.item() if hasattr(value, 'item') else value for value in row]
+
+class ScreenerService:
+    """
+    Runs the scan loop and fans its results out to subscribers. Scans run in
+    a worker thread; diffs are computed and published on the event loop.
+    """
+
+    def __init__(self, symbols, scan_date=None, interval=REFRESH_INTERVAL_SEC, chunk_size=BULK_CHUNK_SIZE):
+        self.symbols = list(symbols)
+        self.scan_date = scan_date  # None follows today's live session
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.session = None
+        self.version = 0
+        self.rows = {}
+        self.order = []
+        self.pct_changes = {}
+        self.updated_at = None
+        self.last_metrics = None
+        self.subscribers = set()
+
+    def snapshot(self):
+        return {
+            'version': self.version,
+            'scan_date': self.session.scan_date.isoformat() if self.session else self.scan_date,
+            'updated_at': self.updated_at,
+            'rows': [self.rows[symbol] for symbol in self.order],
+            'pct_changes': self.pct_changes,
+        }
+
+    def _session_day(self, now):
+        """
+        Today once its session has opened, otherwise the last trading day, so
+        nights, weekends and holidays keep showing the last session.
+        """
+        calendar = get_trading_calendar()
+        today = now.date()
+        if calendar.is_trading_day(today) and now >= calendar.session_bounds(today)[0]:
+            return today
+        return calendar.sessions_before(today, 1)[-1]
+
+    def _needs_refresh(self, now):
+        """A session that has closed is final, so it is not fetched again."""
+        day = self._session_day(now)
+        if self.session is None or self.session.scan_date != day:
+            return True
+        if day != now.date():
+            return False
+        _, closes = get_trading_calendar().session_bounds(day)
+        return now <= closes + CLOSE_GRACE
+
+    def scan(self):
+        """One blocking scan; returns ranked rows and pct changes, or None when nothing was fetched."""
+        metrics = get_metrics()
+        metrics.reset()
+        if self.scan_date:
+            results, pct_changes = scan_symbols(self.symbols, self.scan_date, chunk_size=self.chunk_size)
+        else:
+            now = now_ist()
+            if not self._needs_refresh(now):
+                return None
+            day = self._session_day(now)
+            if self.session is None or self.session.scan_date != day:
+                self.session = LiveSession(self.symbols, day, chunk_size=self.chunk_size)
+                self.session.start()
+            else:
+                self.session.refresh()
+            results, pct_changes = self.session.results()
+        display_results = rank_results(results, pct_changes)
+        self.last_metrics = metrics.snapshot()
+        return display_results, pct_changes
+
+    def apply(self, display_results, pct_changes):
+        """Stores a scan's rows and returns the changes event for subscribers (None when nothing changed)."""
+        rows = {row[0]: _json_row(row) for row in display_results}
+        order = list(rows)
+        changed = [row for symbol, row in rows.items() if self.rows.get(symbol) != row]
+        removed = [symbol for symbol in self.rows if symbol not in rows]
+        pct_changes = {symbol: (pct.item() if hasattr(pct, 'item') else pct) for symbol, pct in pct_changes.items()}
+        self.updated_at = time.time()
+        if not changed and not removed and order == self.order and pct_changes == self.pct_changes:
+            return None
+        self.version += 1
+        event = {'version': self.version, 'updated_at': self.updated_at, 'changed': changed, 'removed': removed,
+                 'order': order if order != self.order else None, 'pct_changes': pct_changes}
+        self.rows, self.order, self.pct_changes = rows, order, pct_changes
+        return event
+
+    def publish(self, event_type, data):
+        message = f"event: {event_type}\ndata: {json.dumps(data)}\n\n".encode()
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A client this far behind is disconnected; it reconnects to a fresh snapshot
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def run_scans(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                scanned = await loop.run_in_executor(None, self.scan)
+            except Exception as e:
+                print(f"Error in scan loop: {e}")
+                scanned = None
+            if scanned is not None:
+                event = self.apply(*scanned)
+                if event is not None:
+                    self.publish("changes", event)
+                if self.scan_date:
+                    return  # a historical day does not change
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1')
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.split()
+            if len(parts) < 2:
+                return
+            method, path = parts[0], urlsplit(parts[1]).path
+            if method != "GET":
+                await self._send(writer, 405, {'error': 'method not allowed'})
+            elif path == "/results":
+                await self._send(writer, 200, self.snapshot())
+            elif path == "/events":
+                await self._stream(writer)
+            elif path == "/metrics":
+                await self._send(writer, 200, self.last_metrics or {})
+            elif path == "/health":
+                await self._send(writer, 200, {'ok': True, 'version': self.version,
+                                               'subscribers': len(self.subscribers)})
+            else:
+                await self._send(writer, 404, {'error': 'not found'})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        # Subscribe before the snapshot goes out: changes published while a large
+        # snapshot drains are queued behind it instead of being lost
+        self.subscribers.add(queue)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Connection: keep-alive\r\n\r\n")
+            writer.write(f"event: snapshot\ndata: {json.dumps(self.snapshot())}\n\n".encode())
+            await writer.drain()
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_SEC)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    return
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Screener service on http://{host}:{port} ({len(self.symbols)} symbols)")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_scans())
+
+def serve(symbols, host="127.0.0.1", port=8765, scan_date=None, interval=REFRESH_INTERVAL_SEC,
+          chunk_size=BULK_CHUNK_SIZE):
+    if scan_date:
+        datetime.strptime(scan_date, "%Y-%m-%d")
+    asyncio.run(ScreenerService(symbols, scan_date, interval, chunk_size).serve(host, port))
@@ -0,0 +1,60 @@
+import json
+import urllib.request
+
+CLIENT_TIMEOUT_SEC = 30  # longer than the service's keepalive interval
+
+class ServiceClient:
+    """Reads results from a screener_service over HTTP, for the Tk window in thin-client mode."""
+
+    def __init__(self, url, timeout=CLIENT_TIMEOUT_SEC):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.rows = {}
+        self.order = []
+        self.pct_changes = {}
+
+    def results(self):
+        """The service's current rows. Reads its own snapshot, so it is safe while follow() runs in another thread."""
+        with urllib.request.urlopen(self.url + "/results", timeout=self.timeout) as response:
+            snapshot = json.load(response)
+        return [tuple(row) for row in snapshot['rows']]
+
+    def display_rows(self):
+        return [tuple(self.rows[symbol]) for symbol in self.order]
+
+    def _load(self, snapshot):
+        self.rows = {row[0]: row for row in snapshot['rows']}
+        self.order = [row[0] for row in snapshot['rows']]
+        self.pct_changes = snapshot['pct_changes']
+
+    def _apply(self, changes):
+        for row in changes['changed']:
+            if row[0] not in self.rows and changes['order'] is None:
+                self.order.append(row[0])
+            self.rows[row[0]] = row
+        for symbol in changes['removed']:
+            self.rows.pop(symbol, None)
+        if changes['order'] is not None:
+            self.order = changes['order']
+        else:
+            self.order = [symbol for symbol in self.order if symbol in self.rows]
+        self.pct_changes = changes['pct_changes']
+
+    def follow(self):
+        """
+        Subscribes to the event stream and yields the full ranked rows after the
+        initial snapshot and after every change. Returns when the stream ends.
+        """
+        with urllib.request.urlopen(self.url + "/events", timeout=self.timeout) as response:
+            event = None
+            for line in response:
+                line = line.decode().rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                    if event == "snapshot":
+                        self._load(data)
+                    else:
+                        self._apply(data)
+                    yield self.display_rows()
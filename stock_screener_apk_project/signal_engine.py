@@ -0,0 +1,121 @@
+import numpy as np
+
+from metrics import get_metrics
+from screener_core import BODY_RATIO, CANDLES_BEFORE, CANDLES_START, CLOSE_NEAR_EXTREME, MA_WINDOW
+
+OHLCV_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+def build_panel(candles, candles_before=CANDLES_BEFORE, candles_start=CANDLES_START):
+    """
+    Stacks {symbol: (before_10min, start_10min)} into a (symbols x bars x OHLCV)
+    float64 panel. Each row holds the last candles_before bars before the session,
+    right-aligned and NaN-padded, followed by the first candles_start session bars.
+    Returns (symbols, panel, start_counts).
+    """
+    symbols = list(candles)
+    bars = candles_before + candles_start
+    panel = np.full((len(symbols), bars, len(OHLCV_COLS)), np.nan)
+    start_counts = np.zeros(len(symbols), dtype=np.int64)
+    for i, symbol in enumerate(symbols):
+        before_10min, start_10min = candles[symbol]
+        if before_10min is not None and len(before_10min) and candles_before:
+            before = before_10min[OHLCV_COLS].to_numpy(dtype=float)[-candles_before:]
+            panel[i, candles_before - len(before):candles_before] = before
+        if start_10min is not None and len(start_10min):
+            start = start_10min[OHLCV_COLS].to_numpy(dtype=float)[:candles_start]
+            panel[i, candles_before:candles_before + len(start)] = start
+            start_counts[i] = len(start)
+    return symbols, panel, start_counts
+
+def rolling_mean(values, window):
+    """
+    Trailing mean along the last axis using one cumulative sum. Like
+    pandas rolling(window).mean(), a window holding any NaN yields NaN.
+    """
+    return rolling_means(values, [window])[window]
+
+def rolling_means(values, windows):
+    """rolling_mean for several windows off the same cumulative sums. Returns {window: means}."""
+    finite = np.isfinite(values)
+    sums = np.cumsum(np.where(finite, values, 0.0), axis=-1)
+    counts = np.cumsum(finite, axis=-1)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(sums, pad)
+    counts = np.pad(counts, pad)
+    means = {}
+    for window in windows:
+        out = np.full(values.shape, np.nan)
+        if window <= values.shape[-1]:
+            window_sums = sums[..., window:] - sums[..., :-window]
+            window_counts = counts[..., window:] - counts[..., :-window]
+            out[..., window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+        means[window] = out
+    return means
+
+def compute_features(panel, start_counts, ma_window=MA_WINDOW, candles_start=CANDLES_START,
+                     body_ratio=BODY_RATIO, close_near_extreme=CLOSE_NEAR_EXTREME):
+    """Computes every per-symbol flag check_first2_against_ma44 uses, for the whole panel at once."""
+    metrics = get_metrics()
+    with metrics.timer("ma"):
+        ma = rolling_mean(panel[:, :, CLOSE], ma_window)
+    with metrics.timer("signal"):
+        features = first2_features(panel[:, -candles_start:, :], ma[:, -2:], start_counts,
+                                   body_ratio, close_near_extreme)
+    features['ma'] = ma
+    return features
+
+def first2_features(first2, last2_ma, start_counts, body_ratio=BODY_RATIO, close_near_extreme=CLOSE_NEAR_EXTREME):
+    """
+    Flags for the session's first candles (symbols x candles x OHLCV) against
+    the MA values at those candles (symbols x 2). Used directly by callers that
+    maintain the MA themselves, such as the live session.
+    """
+    o, h, l, c = (first2[:, :, k] for k in (OPEN, HIGH, LOW, CLOSE))
+    rng = np.abs(h - l)
+    body = np.abs(c - o)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        body_ok = (rng > 0) & (body / np.where(rng > 0, rng, 1.0) > body_ratio)
+    second_range = h[:, -1] - l[:, -1]
+    return {
+        'valid': ((start_counts >= 2) & np.isfinite(first2).all(axis=(1, 2))
+                  & np.isfinite(last2_ma).all(axis=1)),
+        'green': (c > o).all(axis=1),
+        'red': (o > c).all(axis=1),
+        'above_ma': (l > last2_ma).all(axis=1),
+        'below_ma': (h < last2_ma).all(axis=1),
+        'strong_bodies': body_ok.all(axis=1),
+        'ma_slope_up': last2_ma[:, 1] > last2_ma[:, 0],
+        'ma_slope_down': last2_ma[:, 1] < last2_ma[:, 0],
+        'close_near_high': np.abs(c[:, -1] - h[:, -1]) < close_near_extreme * second_range,
+        'close_near_low': np.abs(c[:, -1] - l[:, -1]) < close_near_extreme * second_range,
+    }
+
+def classify(features):
+    """Maps feature arrays to the same labels check_first2_against_ma44 returns."""
+    f = features
+    bullish = f['green'] & f['above_ma']
+    bearish = f['red'] & f['below_ma'] & ~bullish
+    labels = np.full(len(bullish), "No Signal", dtype=object)
+    labels[bullish] = "Bullish"
+    labels[bullish & f['strong_bodies'] & f['ma_slope_up'] & f['close_near_high']] = "Confirmed Bullish"
+    labels[bearish] = "Bearish"
+    labels[bearish & f['strong_bodies'] & f['ma_slope_down'] & f['close_near_low']] = "Confirmed Bearish"
+    labels[~f['valid']] = "Not enough data"
+    return labels
+
+def evaluate_signals(candles, ma_window=MA_WINDOW, candles_before=CANDLES_BEFORE, candles_start=CANDLES_START):
+    """
+    Batch equivalent of get_44ma_on_52candles_from_date + check_first2_against_ma44
+    for a whole universe. candles maps symbol -> (before_10min, start_10min).
+    Returns {symbol: label}.
+    """
+    if not candles:
+        return {}
+    metrics = get_metrics()
+    with metrics.timer("panel"):
+        symbols, panel, start_counts = build_panel(candles, candles_before, candles_start)
+    features = compute_features(panel, start_counts, ma_window, candles_start)
+    with metrics.timer("signal"):
+        labels = classify(features)
+    return dict(zip(symbols, labels.tolist()))
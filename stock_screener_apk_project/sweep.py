@@ -0,0 +1,103 @@
+"""
+Parameter sweep for the first-two-candle signal.
+
+The 5-min data for every symbol and day is downloaded once and resampled
+once per bar size; every MA window then comes off one shared cumulative sum,
+and every body / close-near-extreme threshold pair reuses the same panel.
+Each configuration is scored by how often the session closed beyond the
+second candle's close in the signal's direction.
+"""
+import itertools
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from screener_core import (BODY_RATIO, BULK_CHUNK_SIZE, CANDLES_BEFORE, CANDLES_START, CLOSE_NEAR_EXTREME, MA_WINDOW,
+                           fetch_5min_data_bulk, resample_bars)
+from signal_engine import CLOSE, OHLCV_COLS, classify, first2_features, rolling_means
+from trading_calendar import get_trading_calendar
+
+BAR_SIZES = (5, 10, 15)
+MA_WINDOWS = (20, MA_WINDOW, 50)
+BODY_RATIOS = (0.3, BODY_RATIO, 0.5)
+CLOSE_NEAR_EXTREMES = (0.1, CLOSE_NEAR_EXTREME, 0.2)
+LABELS = ["Confirmed Bullish", "Bullish", "Confirmed Bearish", "Bearish", "No Signal", "Not enough data"]
+
+def sweep_window(days, bar_sizes, candles_before):
+    """Download range with candles_before bars of the coarsest bar size before the first day, through the last day."""
+    start, _ = get_trading_calendar().plan_window(days[0], candles_before, bar_minutes=max(bar_sizes))
+    return start, days[-1] + timedelta(days=1)
+
+def load_sweep_data(symbols, days, bar_sizes, candles_before, chunk_size=BULK_CHUNK_SIZE):
+    start, end = sweep_window(days, bar_sizes, candles_before)
+    frames = fetch_5min_data_bulk(symbols, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), chunk_size)
+    return {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+
+def build_sweep_panel(frames, days, bar_minutes, candles_before, candles_start=CANDLES_START):
+    """
+    One build_panel-style row per (symbol, day): the last candles_before bars
+    of bar_minutes before the day, right-aligned and NaN-padded, then the
+    day's first candles_start bars. Returns (keys, panel, start_counts,
+    day_close) where day_close is the session's last 5-min close.
+    """
+    rows = []
+    for symbol, df_5min in frames.items():
+        bars = resample_bars(df_5min, bar_minutes)
+        values = bars[OHLCV_COLS].to_numpy(dtype=float)
+        bar_days = bars.index.date
+        day_close = df_5min['Close'].groupby(df_5min.index.date).last()
+        for day in days:
+            if day not in day_close.index:
+                continue
+            first = np.searchsorted(bar_days, day, side='left')
+            last = np.searchsorted(bar_days, day, side='right')
+            rows.append(((symbol, day), values[max(0, first - candles_before):first],
+                         values[first:min(last, first + candles_start)], day_close[day]))
+    panel = np.full((len(rows), candles_before + candles_start, len(OHLCV_COLS)), np.nan)
+    start_counts = np.zeros(len(rows), dtype=np.int64)
+    for i, (_, before, start, _) in enumerate(rows):
+        panel[i, candles_before - len(before):candles_before] = before
+        panel[i, candles_before:candles_before + len(start)] = start
+        start_counts[i] = len(start)
+    return [row[0] for row in rows], panel, start_counts, np.array([row[3] for row in rows], dtype=float)
+
+def score(labels, entry, exit_):
+    """Signal counts and hit rates for one configuration's labels."""
+    row = {label: int((labels == label).sum()) for label in LABELS}
+    bullish = np.isin(labels, ["Confirmed Bullish", "Bullish"])
+    bearish = np.isin(labels, ["Confirmed Bearish", "Bearish"])
+    confirmed = np.isin(labels, ["Confirmed Bullish", "Confirmed Bearish"])
+    hits = (bullish & (exit_ > entry)) | (bearish & (exit_ < entry))
+    signals = bullish | bearish
+    row['Signals'] = int(signals.sum())
+    row['Hit Rate'] = hits.sum() / row['Signals'] if row['Signals'] else np.nan
+    row['Confirmed Hit Rate'] = (hits & confirmed).sum() / confirmed.sum() if confirmed.any() else np.nan
+    return row
+
+def run_sweep(frames, days, bar_sizes=BAR_SIZES, ma_windows=MA_WINDOWS, body_ratios=BODY_RATIOS,
+              close_near_extremes=CLOSE_NEAR_EXTREMES, candles_start=CANDLES_START):
+    """Evaluates every configuration on already loaded 5-min frames; returns one table row per configuration."""
+    candles_before = max(CANDLES_BEFORE, max(ma_windows))
+    table = []
+    for bar_minutes in bar_sizes:
+        keys, panel, start_counts, day_close = build_sweep_panel(frames, days, bar_minutes, candles_before,
+                                                                 candles_start)
+        first2 = panel[:, -candles_start:, :]
+        entry = first2[:, -1, CLOSE]
+        mas = rolling_means(panel[:, :, CLOSE], ma_windows)
+        for ma_window in ma_windows:
+            last2_ma = mas[ma_window][:, -2:]
+            for body_ratio, close_near_extreme in itertools.product(body_ratios, close_near_extremes):
+                labels = classify(first2_features(first2, last2_ma, start_counts, body_ratio, close_near_extreme))
+                row = {'Bar Minutes': bar_minutes, 'MA Window': ma_window, 'Body Ratio': body_ratio,
+                       'Close Near Extreme': close_near_extreme, 'Symbol Days': len(keys)}
+                row.update(score(labels, entry, day_close))
+                table.append(row)
+    return pd.DataFrame(table)
+
+def sweep_symbols(symbols, days, bar_sizes=BAR_SIZES, ma_windows=MA_WINDOWS, body_ratios=BODY_RATIOS,
+                  close_near_extremes=CLOSE_NEAR_EXTREMES, chunk_size=BULK_CHUNK_SIZE):
+    """Loads the data for symbols over days once and sweeps every configuration on it."""
+    frames = load_sweep_data(symbols, days, bar_sizes, max(CANDLES_BEFORE, max(ma_windows)), chunk_size)
+    return run_sweep(frames, days, bar_sizes, ma_windows, body_ratios, close_near_extremes)
@@ -0,0 +1,120 @@
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+IST = 'Asia/Kolkata'
+SESSION_OPEN = (9, 15)
+SESSION_CLOSE = (15, 30)
+SESSION_MINUTES = (SESSION_CLOSE[0] - SESSION_OPEN[0]) * 60 + SESSION_CLOSE[1] - SESSION_OPEN[1]
+DEFAULT_HOLIDAYS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nse_holidays.txt")
+MAX_LOOKBACK_DAYS = 366  # stops a search when the holiday file blocks out every day
+
+def load_holidays(path=DEFAULT_HOLIDAYS_PATH):
+    """
+    Reads trading holidays, one YYYY-MM-DD per line; text after # is a comment.
+    A missing file means weekends are the only non-trading days.
+    """
+    holidays = set()
+    if not os.path.exists(path):
+        print(f"No holiday file at {path}; treating every weekday as a trading day")
+        return holidays
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                holidays.add(datetime.strptime(line, "%Y-%m-%d").date())
+    return holidays
+
+def bars_per_session(bar_minutes):
+    return math.ceil(SESSION_MINUTES / bar_minutes)
+
+def now_ist():
+    return pd.Timestamp.now(tz=IST)
+
+class TradingCalendar:
+    """NSE cash-market sessions: weekdays, 09:15 to 15:30 IST, minus the listed holidays."""
+
+    def __init__(self, holidays=None):
+        self.holidays = set(holidays or ())
+
+    def is_trading_day(self, day):
+        return day.weekday() < 5 and day not in self.holidays
+
+    def trading_days(self, start_day, end_day):
+        """Trading days from start_day to end_day, both inclusive."""
+        days = []
+        day = start_day
+        while day <= end_day:
+            if self.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def sessions_before(self, day, n):
+        """The n trading days before day, oldest first."""
+        days = []
+        probe = day
+        while len(days) < n and (day - probe).days < MAX_LOOKBACK_DAYS:
+            probe -= timedelta(days=1)
+            if self.is_trading_day(probe):
+                days.append(probe)
+        return days[::-1]
+
+    def session_bounds(self, day):
+        """(open, close) of day's session as IST timestamps."""
+        start = pd.Timestamp(day).tz_localize(IST)
+        return (start + timedelta(hours=SESSION_OPEN[0], minutes=SESSION_OPEN[1]),
+                start + timedelta(hours=SESSION_CLOSE[0], minutes=SESSION_CLOSE[1]))
+
+    def plan_window(self, day, bars_before, bar_minutes=10, min_sessions=0):
+        """
+        Minimal (start_day, end_day) download range, end exclusive, for the
+        session on day plus bars_before bars of bar_minutes before it: only
+        as many prior trading sessions as hold those bars (and at least
+        min_sessions), however many weekends and holidays lie in between.
+        """
+        sessions = max(math.ceil(bars_before / bars_per_session(bar_minutes)), min_sessions)
+        prior = self.sessions_before(day, sessions)
+        return (prior[0] if prior else day), day + timedelta(days=1)
+
+    def recent_window(self, today, sessions):
+        """Range covering the last `sessions` trading sessions up to and including today."""
+        last = today if self.is_trading_day(today) else self.sessions_before(today, 1)[-1]
+        prior = self.sessions_before(last, sessions - 1)
+        return (prior[0] if prior else last), last + timedelta(days=1)
+
+    def split_range(self, start_day, end_day, max_days=None):
+        """
+        Splits [start_day, end_day) into request windows spanning at most
+        max_days calendar days that start and end on trading days, so no request
+        covers only weekends or holidays. A range without any trading day is
+        returned as is and left to the provider.
+        """
+        days = self.trading_days(start_day, end_day - timedelta(days=1))
+        if not days:
+            return [(start_day, end_day)]
+        windows = []
+        for day in days:
+            if windows and (max_days is None or (day - windows[-1][0]).days < max_days):
+                windows[-1][1] = day + timedelta(days=1)
+            else:
+                windows.append([day, day + timedelta(days=1)])
+        return [tuple(window) for window in windows]
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+def get_trading_calendar():
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = TradingCalendar(load_holidays())
+        return _calendar
+
+def set_trading_calendar(calendar):
+    global _calendar
+    with _calendar_lock:
+        _calendar = calendar
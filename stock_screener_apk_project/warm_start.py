@@ -0,0 +1,76 @@
+"""
+Warm start for the Tk window. After every scan the ranked rows are saved as
+a small JSON file and a live session's per-symbol candle arrays as one .npz;
+at launch the rows fill the table before pandas has even been imported, and
+the first live scan resumes the saved session instead of reloading the whole
+scan window.
+
+Only the standard library is imported here; numpy and the live session are
+imported by the functions that need them, which run off the Tk thread.
+"""
+import json
+import os
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_PATH = os.path.join(APP_DIR, "warm_start.json")
+DEFAULT_SESSION_PATH = os.path.join(APP_DIR, "warm_start_session.npz")
+
+def _json_value(value):
+    return value.item() if hasattr(value, 'item') else value
+
+def save_results(display_results, mode, scan_date, path=DEFAULT_RESULTS_PATH):
+    snapshot = {
+        'saved_at': time.time(),
+        'mode': mode,
+        'scan_date': scan_date.isoformat(),
+        'rows': [[_json_value(value) for value in row] for row in display_results],
+    }
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error saving warm-start results: {e}")
+
+def load_results(path=DEFAULT_RESULTS_PATH):
+    """The last saved results, or None when there are none or the file cannot be read."""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+        snapshot['rows'] = [tuple(row) for row in snapshot['rows']]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error loading warm-start results: {e}")
+        return None
+    return snapshot
+
+def save_session(session, path=DEFAULT_SESSION_PATH):
+    import numpy as np
+    if not session.symbols:
+        return
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **session.snapshot())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error saving warm-start session: {e}")
+
+def load_session(symbols, scan_date, chunk_size=None, path=DEFAULT_SESSION_PATH):
+    """The saved live session if it is for scan_date and exactly these symbols, else None."""
+    if not os.path.exists(path):
+        return None
+    import numpy as np
+    from live_session import LiveSession
+    try:
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        if str(arrays['scan_date']) != scan_date.isoformat() or arrays['symbols'].tolist() != list(symbols):
+            return None
+        return LiveSession.restore(arrays, chunk_size)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading warm-start session: {e}")
+        return None
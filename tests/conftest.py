@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "stock_screener_apk_project"))
+
+import pytest
+
+from candle_cache import set_candle_cache
+from data_providers import ReplayProvider, set_data_provider
+from fetch_pipeline import FetchPipeline, set_fetch_pipeline
+
+SYMBOLS = ["ABB.NS", "ACC.NS", "SBIN.NS", "TCS.NS", "INFY.NS"] + [f"SYN{i}.NS" for i in range(25)]
+
+@pytest.fixture
+def replay():
+    """Generated bars through an unthrottled pipeline; the on-disk candle cache is never touched."""
+    provider = ReplayProvider(now=None)
+    set_data_provider(provider)
+    set_fetch_pipeline(FetchPipeline(rate_per_sec=1e9, burst=1e9))
+    set_candle_cache(None)
+    yield provider
+    set_data_provider(None)
+    set_fetch_pipeline(None)
+
+def same_row(a, b):
+    """Result rows are equal up to float rounding in the prices and MA."""
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        if isinstance(x, float) and isinstance(y, float):
+            if abs(x - y) > 1e-9 * max(1.0, abs(x)):
+                return False
+        elif x != y:
+            return False
+    return True
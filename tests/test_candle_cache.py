@@ -0,0 +1,189 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import candle_cache
+import screener_core
+from candle_cache import CandleCache, set_candle_cache
+from data_providers import set_data_provider
+from fetch_pipeline import FetchPipeline, set_fetch_pipeline
+from metrics import ScanMetrics, get_metrics, set_metrics
+from screener_core import fetch_5min_data_bulk, load_scan_data_bulk
+from trading_calendar import TradingCalendar, set_trading_calendar
+
+SYMBOLS = ["ABB.NS", "TCS.NS", "SBIN.NS", "INFY.NS"]
+HOLIDAY = date(2024, 5, 20)
+WEEK = [date(2024, 5, 13), date(2024, 5, 14), date(2024, 5, 15), date(2024, 5, 16), date(2024, 5, 17)]
+
+class _Recorder:
+    """Passes downloads through to the replay provider, recording each request and dropping chosen bars."""
+
+    name = "recorder"
+    max_days = None
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.requests = []
+        self.dropped = {}  # day -> symbols whose bars are left out, or None for every symbol
+
+    def download(self, tickers, start_date=None, end_date=None, **kwargs):
+        self.requests.append((tuple(tickers), pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        data = self.provider.download(tickers, start_date, end_date, **kwargs)
+        for day, symbols in self.dropped.items():
+            if data.empty:
+                break
+            on_day = data.index.date == day
+            if symbols is None:
+                data = data[~on_day]
+            else:
+                for symbol in symbols:
+                    data.loc[on_day, symbol] = float('nan')
+        return data
+
+@pytest.fixture
+def cache(replay, tmp_path, monkeypatch):
+    set_trading_calendar(TradingCalendar({HOLIDAY}))
+    recorder = _Recorder(replay)
+    set_data_provider(recorder)
+    store = CandleCache(str(tmp_path / "candles.sqlite3"))
+    set_candle_cache(store)
+    store.recorder = recorder
+    yield store
+    store.close()
+    set_candle_cache(None)
+    set_trading_calendar(None)
+
+def _at(replay, monkeypatch, when):
+    now = pd.Timestamp(when, tz="Asia/Kolkata")
+    replay.now = lambda: now
+    monkeypatch.setattr(screener_core, "now_ist", lambda: now)
+    return now
+
+def _week(symbols=SYMBOLS):
+    return fetch_5min_data_bulk(symbols, "2024-05-13", "2024-05-18")
+
+def _same_frames(a, b):
+    assert a.keys() == b.keys()
+    for symbol in a:
+        pd.testing.assert_frame_equal(a[symbol], b[symbol], check_freq=False)
+
+def test_past_sessions_are_marked_complete_and_served_from_disk(cache, replay, monkeypatch):
+    _at(replay, monkeypatch, "2024-05-21 10:00")
+    first = _week()
+    assert cache.recorder.requests
+    for symbol in SYMBOLS:
+        assert cache.complete_days(symbol, WEEK[0], date(2024, 5, 18)) == set(WEEK)
+    cache.recorder.requests.clear()
+    _same_frames(first, _week())
+    assert cache.recorder.requests == []
+
+def test_second_historical_scan_makes_no_provider_calls(cache, replay, monkeypatch):
+    _at(replay, monkeypatch, "2024-05-21 10:00")
+    first = load_scan_data_bulk(SYMBOLS, "2024-05-17")
+    cache.recorder.requests.clear()
+    second = load_scan_data_bulk(SYMBOLS, "2024-05-17")
+    assert cache.recorder.requests == []
+    for symbol in SYMBOLS:
+        pd.testing.assert_frame_equal(first[symbol][0], second[symbol][0], check_freq=False)
+        pd.testing.assert_frame_equal(first[symbol][1], second[symbol][1], check_freq=False)
+
+def test_day_without_bars_for_any_ticker_is_stored_as_a_holiday(cache, replay, monkeypatch):
+    _at(replay, monkeypatch, "2024-05-21 10:00")
+    unlisted = date(2024, 5, 15)
+    cache.recorder.dropped[unlisted] = None
+    frames = _week()
+    for symbol in SYMBOLS:
+        assert unlisted in cache.complete_days(symbol, WEEK[0], date(2024, 5, 18))
+        assert unlisted not in set(frames[symbol].index.date)
+    cache.recorder.requests.clear()
+    _week()
+    assert cache.recorder.requests == []
+
+def test_symbol_missing_from_a_response_is_not_marked_complete(cache, replay, monkeypatch):
+    _at(replay, monkeypatch, "2024-05-21 10:00")
+    gap = date(2024, 5, 15)
+    cache.recorder.dropped[gap] = ["TCS.NS"]
+    _week()
+    assert gap not in cache.complete_days("TCS.NS", WEEK[0], date(2024, 5, 18))
+    assert gap in cache.complete_days("ABB.NS", WEEK[0], date(2024, 5, 18))
+    cache.recorder.dropped.clear()
+    cache.recorder.requests.clear()
+    frames = _week()
+    assert [symbols for symbols, _, _ in cache.recorder.requests] == [("TCS.NS",)]
+    assert gap in set(frames["TCS.NS"].index.date)
+    assert cache.complete_days("TCS.NS", WEEK[0], date(2024, 5, 18)) == set(WEEK)
+
+def test_open_session_is_refreshed_from_the_last_stored_bar(cache, replay, monkeypatch):
+    today = date(2024, 5, 17)
+
+    def refresh():
+        return fetch_5min_data_bulk(SYMBOLS, "2024-05-16", "2024-05-18")
+
+    _at(replay, monkeypatch, "2024-05-17 11:00")
+    refresh()
+    last = {symbol: cache.last_timestamp(symbol, today) for symbol in SYMBOLS}
+    assert set(last.values()) == {pd.Timestamp("2024-05-17 11:00", tz="Asia/Kolkata")}
+    assert today not in cache.complete_days("ABB.NS", today, date(2024, 5, 18))
+    cache.recorder.requests.clear()
+    now = _at(replay, monkeypatch, "2024-05-17 11:30")
+    frames = refresh()
+    # Only the tail of the open session is asked for, not the completed 16th
+    assert cache.recorder.requests
+    assert {start for _, start, _ in cache.recorder.requests} == {last["ABB.NS"]}
+    for symbol in SYMBOLS:
+        assert frames[symbol].index[-1] == now
+        assert frames[symbol].index[0].date() == date(2024, 5, 16)
+    # Bars fetched within CLOSE_GRACE of the close may still change, so the day stays open
+    _at(replay, monkeypatch, "2024-05-17 15:32")
+    refresh()
+    assert today not in cache.complete_days("ABB.NS", today, date(2024, 5, 18))
+    _at(replay, monkeypatch, "2024-05-17 15:40")
+    refresh()
+    assert today in cache.complete_days("ABB.NS", today, date(2024, 5, 18))
+    cache.recorder.requests.clear()
+    refresh()
+    assert cache.recorder.requests == []
+
+def test_symbols_that_give_up_fall_back_to_the_cache(cache, replay, monkeypatch):
+    _at(replay, monkeypatch, "2024-05-17 11:00")
+    before = fetch_5min_data_bulk(SYMBOLS, "2024-05-16", "2024-05-18")
+    _at(replay, monkeypatch, "2024-05-17 11:30")
+    replay.failure_rate = 1.0
+    previous = get_metrics()
+    metrics = ScanMetrics()
+    set_metrics(metrics)
+    set_fetch_pipeline(FetchPipeline(rate_per_sec=1e9, burst=1e9, retries=1, backoff_base=0))
+    try:
+        after = fetch_5min_data_bulk(SYMBOLS, "2024-05-16", "2024-05-18")
+    finally:
+        set_metrics(previous)
+    _same_frames(before, after)
+    assert metrics.counters["gave_up"] == len(SYMBOLS)
+
+def test_eviction_drops_old_then_least_recently_fetched_sessions(cache, replay, monkeypatch):
+    clock = [1_700_000_000.0]
+
+    def tick():
+        clock[0] += 1
+        return clock[0]
+
+    monkeypatch.setattr(candle_cache.time, "time", tick)
+    monkeypatch.setattr(candle_cache, "EVICT_BATCH_SESSIONS", 1)
+    day = date(2024, 5, 15)
+    now = pd.Timestamp("2024-05-21 10:00", tz="Asia/Kolkata")
+    bars = len(replay.synthetic_day("ABB.NS", day))
+    cache.max_rows = 2 * bars
+    for symbol in ["ABB.NS", "TCS.NS", "SBIN.NS"]:
+        cache.store(symbol, replay.synthetic_day(symbol, day), [day], now)
+    cache.evict()
+    assert cache.load("ABB.NS", day, date(2024, 5, 16)) is None
+    assert cache.complete_days("ABB.NS", day, date(2024, 5, 16)) == set()
+    assert cache.complete_days("TCS.NS", day, date(2024, 5, 16)) == {day}
+    assert len(cache.load("SBIN.NS", day, date(2024, 5, 16))) == bars
+    clock[0] += cache.max_age_days * 86400
+    cache.store("INFY.NS", replay.synthetic_day("INFY.NS", day), [day], now)
+    cache.evict()
+    assert cache.load("TCS.NS", day, date(2024, 5, 16)) is None
+    assert cache.load("SBIN.NS", day, date(2024, 5, 16)) is None
+    assert cache.complete_days("INFY.NS", day, date(2024, 5, 16)) == {day}
@@ -0,0 +1,34 @@
+import pickle
+from datetime import date
+
+from data_providers import ReplayProvider
+
+def _outcomes(provider, requests):
+    outcomes = []
+    for tickers in requests:
+        try:
+            data = provider.download(tickers, "2024-05-15", "2024-05-16", group_by="ticker")
+            outcomes.append(sorted(data.columns.get_level_values(0).unique()))
+        except ConnectionError:
+            outcomes.append("failed")
+    return outcomes
+
+def test_injected_failures_depend_on_the_request_not_the_caller():
+    requests = [["ABB.NS", "ACC.NS", "TCS.NS"], ["SBIN.NS", "INFY.NS"]] * 3
+    provider = ReplayProvider(failure_rate=0.3, ticker_failure_rate=0.3, now=None)
+    worker_copy = pickle.loads(pickle.dumps(provider))
+    expected = _outcomes(provider, requests)
+    assert _outcomes(worker_copy, requests) == expected
+    # Another thread order: each request's attempts still fail or succeed the same way
+    reordered = ReplayProvider(failure_rate=0.3, ticker_failure_rate=0.3, now=None)
+    second_first = _outcomes(reordered, requests[1::2]) + _outcomes(reordered, requests[0::2])
+    assert second_first == expected[1::2] + expected[0::2]
+    assert "failed" in expected and len(set(map(str, expected))) > 2
+
+def test_synthetic_bars_do_not_depend_on_the_window():
+    provider = ReplayProvider(now=None)
+    day = provider.bars("ABB.NS", *provider._window("2024-05-15", "2024-05-16"))
+    week = provider.bars("ABB.NS", *provider._window("2024-05-13", "2024-05-18"))
+    assert day.equals(week[week.index.date == date(2024, 5, 15)])
+    assert set(week.index.date) == {date(2024, 5, 13), date(2024, 5, 14), date(2024, 5, 15), date(2024, 5, 16),
+                                    date(2024, 5, 17)}
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pandas as pd
+
+from conftest import SYMBOLS, same_row
+from live_session import LiveSession
+from scanner import scan_symbols
+
+SCAN_DATE = date(2024, 5, 15)
+# Before the open, inside each of the first two candles, right after them and later in the day
+CUTS = ["09:10", "09:17", "09:22", "09:27", "09:32", "09:37", "11:30", "15:30"]
+
+def _assert_same_results(full, live):
+    full_results, full_pct = full
+    live_results, live_pct = live
+    assert len(full_results) == len(live_results)
+    for a, b in zip(full_results, live_results):
+        assert same_row(a, b), (a, b)
+    for symbol in SYMBOLS:
+        if full_pct[symbol] is None:
+            assert live_pct[symbol] is None
+        else:
+            assert abs(full_pct[symbol] - live_pct[symbol]) < 1e-9
+
+def _replay_day(replay, session_for):
+    session = None
+    for cut in CUTS:
+        replay.now = lambda cut=cut: pd.Timestamp(f"{SCAN_DATE} {cut}", tz="Asia/Kolkata")
+        full = scan_symbols(SYMBOLS, SCAN_DATE.isoformat())
+        if session is None:
+            session = LiveSession(SYMBOLS, SCAN_DATE)
+            session.start()
+        else:
+            session.refresh()
+        _assert_same_results(full, session.results())
+        session = session_for(session)
+
+def test_live_session_matches_full_scan_as_the_day_unfolds(replay):
+    _replay_day(replay, lambda session: session)
+
+def test_restored_session_carries_on_like_the_original(replay):
+    def round_trip(session):
+        restored = LiveSession.restore(session.snapshot())
+        assert restored.results() == session.results()
+        return restored
+
+    _replay_day(replay, round_trip)
+
+def test_streamed_rows_cover_every_symbol(replay):
+    for cut in ["11:30", "15:30"]:
+        replay.now = lambda cut=cut: pd.Timestamp(f"{SCAN_DATE} {cut}", tz="Asia/Kolkata")
+        parts = []
+        on_rows = lambda part_rows, done: parts.append((part_rows, done))
+        if cut == "11:30":
+            session = LiveSession(SYMBOLS, SCAN_DATE, chunk_size=7)
+            session.start(on_rows=on_rows)
+        else:
+            session.refresh(on_rows=on_rows)
+        assert len(parts) > 1
+        assert [done for _, done in parts] == sorted(done for _, done in parts)
+        assert parts[-1][1] == len(SYMBOLS)
+        streamed = {row[0]: row for part_rows, _ in parts for row in part_rows}
+        assert streamed == {row[0]: row for row in session.results()[0]}
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import screener_service
+from screener_service import ScreenerService
+
+SYMBOLS = ["ABB.NS", "TCS.NS", "SBIN.NS"]
+
+def _at(replay, monkeypatch, when):
+    now = pd.Timestamp(when, tz="Asia/Kolkata")
+    replay.now = lambda: now
+    monkeypatch.setattr(screener_service, "now_ist", lambda: now)
+
+def test_last_session_stays_up_until_the_next_one_opens(replay, monkeypatch):
+    service = ScreenerService(SYMBOLS)
+    _at(replay, monkeypatch, "2024-05-17 12:00")  # Friday
+    friday, _ = service.scan()
+    assert service.session.scan_date == date(2024, 5, 17)
+    assert {row[5] for row in friday} != {"No Data"}
+    # Saturday night, Monday's election holiday and Tuesday before the open keep Friday's rows
+    for when in ["2024-05-18 00:01", "2024-05-20 12:00", "2024-05-21 09:00"]:
+        _at(replay, monkeypatch, when)
+        assert service.scan() is None
+        assert service.session.scan_date == date(2024, 5, 17)
+    _at(replay, monkeypatch, "2024-05-21 09:20")
+    tuesday, _ = service.scan()
+    assert service.session.scan_date == date(2024, 5, 21)
+    assert {row[5] for row in tuesday} != {"No Data"}
+
+def test_first_scan_on_a_weekend_serves_the_last_session(replay, monkeypatch):
+    service = ScreenerService(SYMBOLS)
+    _at(replay, monkeypatch, "2024-05-19 10:00")  # Sunday
+    rows, _ = service.scan()
+    assert service.session.scan_date == date(2024, 5, 17)
+    assert {row[5] for row in rows} != {"No Data"}
+
+class _SlowWriter:
+    """A writer whose first drain() yields long enough for the scan loop to publish."""
+
+    def __init__(self, service):
+        self.service = service
+        self.chunks = []
+        self.drains = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drains += 1
+        if self.drains == 1:
+            self.service.publish("changes", {'version': 1})
+        elif self.drains == 2:
+            raise ConnectionError("client went away")
+
+def test_changes_published_while_the_snapshot_drains_reach_the_client():
+    service = ScreenerService(SYMBOLS)
+    writer = _SlowWriter(service)
+    with pytest.raises(ConnectionError):
+        asyncio.run(service._stream(writer))
+    body = b"".join(writer.chunks)
+    assert body.index(b"event: snapshot") < body.index(b"event: changes")
+    assert not service.subscribers
@@ -0,0 +1,41 @@
+import collections
+
+import numpy as np
+import pandas as pd
+
+from screener_core import CANDLES_BEFORE, CANDLES_START, MA_WINDOW, check_first2_against_ma44
+from signal_engine import evaluate_signals
+
+def _symbol_days(count, seed=0):
+    """Random 10-min (before, start) frames, including short histories and sessions with 0 to 4 bars."""
+    rng = np.random.default_rng(seed)
+    candles = {}
+    for i in range(count):
+        n_before = int(rng.integers(0, 70))
+        n_start = int(rng.integers(0, 5))
+        n = n_before + n_start
+        index = pd.date_range("2024-05-10 09:15", periods=n, freq="10min", tz="Asia/Kolkata")
+        trend = rng.normal(0, 1)
+        closes = 100 + np.cumsum(rng.normal(trend * 0.3, 0.5, n))
+        opens = closes - rng.normal(trend * 0.3, 0.4, n)
+        highs = np.maximum(opens, closes) + rng.random(n) * 0.1
+        lows = np.minimum(opens, closes) - rng.random(n) * 0.1
+        if i % 7 == 0 and n:
+            highs[-1] = closes[-1]  # close exactly at the high
+        frame = pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes,
+                              'Volume': rng.integers(1, 9, n)}, index=index)
+        candles[f"S{i}"] = (frame.iloc[:n_before], frame.iloc[n_before:])
+    return candles
+
+def _scalar_label(before, start):
+    combined = pd.concat([before.tail(CANDLES_BEFORE), start.head(CANDLES_START)])
+    combined['MA44'] = combined['Close'].rolling(window=MA_WINDOW).mean()
+    return check_first2_against_ma44(start, combined)
+
+def test_vectorised_labels_match_scalar_check():
+    candles = _symbol_days(3000)
+    expected = {symbol: _scalar_label(before, start) for symbol, (before, start) in candles.items()}
+    assert evaluate_signals(candles) == expected
+    # The random frames must reach every label, or the comparison proves little
+    assert set(collections.Counter(expected.values())) == {
+        "Confirmed Bullish", "Bullish", "Confirmed Bearish", "Bearish", "No Signal", "Not enough data"}
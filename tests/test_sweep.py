@@ -0,0 +1,21 @@
+import collections
+from datetime import date
+
+from conftest import SYMBOLS
+from scanner import scan_symbols
+from screener_core import BODY_RATIO, CLOSE_NEAR_EXTREME, MA_WINDOW
+from sweep import LABELS, sweep_symbols
+
+DAYS = [date(2024, 5, 14), date(2024, 5, 15), date(2024, 5, 16)]
+
+def test_default_configuration_matches_per_day_scans(replay):
+    table = sweep_symbols(SYMBOLS, DAYS, bar_sizes=(5, 10), ma_windows=(20, MA_WINDOW),
+                          body_ratios=(BODY_RATIO,), close_near_extremes=(CLOSE_NEAR_EXTREME,))
+    assert len(table) == 4
+    row = table[(table['Bar Minutes'] == 10) & (table['MA Window'] == MA_WINDOW)].iloc[0]
+    counts = collections.Counter()
+    for day in DAYS:
+        results, _ = scan_symbols(SYMBOLS, day.isoformat())
+        counts.update(result[5] for result in results)
+    assert row['Symbol Days'] == len(SYMBOLS) * len(DAYS)
+    assert {label: row[label] for label in LABELS} == {label: counts[label] for label in LABELS}
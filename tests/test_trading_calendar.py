@@ -0,0 +1,63 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import data_providers
+from data_providers import recent_window
+from screener_core import _request_windows, plan_scan_window
+from trading_calendar import TradingCalendar, get_trading_calendar, set_trading_calendar
+
+# Maharashtra Day (Wednesday) and the Mumbai election day (Monday)
+HOLIDAYS = {date(2024, 5, 1), date(2024, 5, 20)}
+
+@pytest.fixture(autouse=True)
+def calendar():
+    set_trading_calendar(TradingCalendar(HOLIDAYS))
+    yield get_trading_calendar()
+    set_trading_calendar(None)
+
+def test_monday_window_reaches_back_over_the_weekend(calendar):
+    # 50 ten-minute bars need two full sessions: Thursday and Friday
+    assert calendar.plan_window(date(2024, 5, 13), 50) == (date(2024, 5, 9), date(2024, 5, 14))
+    # The three-session volume average reaches back to Wednesday
+    assert plan_scan_window("2024-05-13") == ("2024-05-08", "2024-05-14")
+
+def test_window_after_a_holiday_skips_it(calendar):
+    assert calendar.plan_window(date(2024, 5, 21), 50) == (date(2024, 5, 16), date(2024, 5, 22))
+    assert plan_scan_window("2024-05-21") == ("2024-05-15", "2024-05-22")
+    # A midweek holiday: Friday, Monday and Tuesday before Thursday the 2nd
+    assert plan_scan_window("2024-05-02") == ("2024-04-26", "2024-05-03")
+
+def test_recent_window_ends_on_the_last_session(calendar, monkeypatch):
+    last_week = (date(2024, 5, 13), date(2024, 5, 18))
+    assert calendar.recent_window(date(2024, 5, 19), 5) == last_week  # Sunday
+    assert calendar.recent_window(date(2024, 5, 20), 5) == last_week  # holiday
+    assert calendar.recent_window(date(2024, 5, 21), 5) == (date(2024, 5, 14), date(2024, 5, 22))
+    monkeypatch.setattr(data_providers, "now_ist", lambda: pd.Timestamp("2024-05-20 10:00", tz="Asia/Kolkata"))
+    assert recent_window() == ("2024-05-13", "2024-05-18")
+
+def test_split_range_keeps_windows_on_trading_days(calendar):
+    start, end = date(2024, 5, 1), date(2024, 5, 22)
+    assert calendar.split_range(start, end) == [(date(2024, 5, 2), end)]
+    assert calendar.split_range(start, end, max_days=7) == [
+        (date(2024, 5, 2), date(2024, 5, 9)),
+        (date(2024, 5, 9), date(2024, 5, 16)),
+        (date(2024, 5, 16), end),
+    ]
+    # Nothing to trim when the range holds no session
+    assert calendar.split_range(date(2024, 5, 18), date(2024, 5, 21)) == [(date(2024, 5, 18), date(2024, 5, 21))]
+
+def test_request_windows_follow_the_provider_limit(replay):
+    replay.max_days = 7
+    assert _request_windows("2024-05-01", "2024-05-22") == [
+        ("2024-05-02", "2024-05-09"),
+        ("2024-05-09", "2024-05-16"),
+        ("2024-05-16", "2024-05-22"),
+    ]
+    # The open session's tail keeps its intraday start
+    tail = "2024-05-21 11:00:00+05:30"
+    assert _request_windows(tail, "2024-05-22") == [(tail, "2024-05-22")]
+    # Without a limit it is one request, ending after Friday rather than on the holiday
+    replay.max_days = None
+    assert _request_windows("2024-05-13", "2024-05-21") == [("2024-05-13", "2024-05-18")]